@@ -160,6 +160,7 @@ def run_conversion(
         verbosity=opts.runtime.verbosity,
         dry_run=opts.runtime.dry_run,
         status_callback=status_callback,
+        max_probes=opts.runtime.max_probes,
     ) as runtime:
         plan = ClipPlan.from_options(opts, runtime)
         try:
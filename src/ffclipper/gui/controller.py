@@ -25,7 +25,6 @@ class FFClipperController:
         """Store reference to the GUI window."""
         self.gui = gui
         self.processing_thread: VideoProcessingThread | None = None
-        self._cli_baseline = Options.defaults_for_gui()
 
     def get_options(self) -> Options:
         """Collect options from the GUI widgets."""
@@ -53,7 +52,7 @@ class FFClipperController:
     def build_cli_args(self, opts: Options) -> list[str]:
         """Return CLI args for ``opts`` using the shared Options serializer."""
         suppress_output = not self.gui.output_overridden
-        return opts.to_cli_args(suppress_output=suppress_output, baseline=self._cli_baseline)
+        return opts.to_cli_args(suppress_output=suppress_output)
 
     def build_cli_command(self, opts: Options) -> str:
         """Return a shell-safe ffclipper command string for ``opts``."""
@@ -1,7 +1,7 @@
 """Expose models and type definitions."""
 
 from .context import RuntimeContext
-from .ffprobe import AudioInfo, SubtitleTrack, VideoColorInfo, VideoInfo
+from .ffprobe import AudioInfo, ProbeInfo, SubtitleTrack, VideoColorInfo, VideoInfo
 from .options import Options
 from .plan import ClipPlan
 from .types import (
@@ -24,6 +24,7 @@ __all__ = [
     "Container",
     "Encoder",
     "Options",
+    "ProbeInfo",
     "Resolution",
     "RuntimeContext",
     "SubtitleBurnMethod",
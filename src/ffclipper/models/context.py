@@ -9,19 +9,22 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Self
 
-from diskcache import Cache
-
 from ffclipper.models.verbosity import Verbosity
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from types import TracebackType
 
+    from diskcache import Cache
+
 _CACHE_DIR = Path(os.getenv("FFCLIPPER_CACHE", tempfile.gettempdir())) / "ffclipper-cache"
 
 
 def _default_cache() -> Cache:
     """Return a cache for ffclipper operations."""
+    # diskcache pulls in sqlite3; importing it here keeps it off the ``--help`` path.
+    from diskcache import Cache  # noqa: PLC0415
+
     return Cache(str(_CACHE_DIR))
 
 
@@ -34,6 +37,9 @@ class RuntimeContext:
     status_callback: Callable[[str], None] | None = None
     cache: Cache = field(default_factory=_default_cache)
     burn_subtitle_path: Path | None = None
+    tools_validated: bool = False
+    max_probes: int | None = None
+    probe_results: dict[tuple[object, ...], object] = field(default_factory=dict, repr=False)
 
     def close(self) -> None:
         """Close any open resources."""
@@ -42,3 +42,13 @@ class AudioInfo:
 
     codec: str | None = None
     bitrate: int | None = None
+
+
+@dataclass(frozen=True)
+class ProbeInfo:
+    """Container and first-stream metadata gathered by a single ffprobe call."""
+
+    duration_sec: float | None = None
+    video: VideoInfo | None = None
+    audio: AudioInfo | None = None
+    color: VideoColorInfo | None = None
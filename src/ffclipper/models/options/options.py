@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 from enum import Enum, IntEnum
+from functools import cache
+from itertools import chain
 from pathlib import Path
-from typing import Annotated
-from urllib.parse import urlparse
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Annotated, Any
 
 from cyclopts import Parameter
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from ffclipper.models.annotations import EnableWhen, FieldLabel
-from ffclipper.models.types import AudioCodec, Container, Encoder, SubtitleBurnMethod
+from ffclipper.models.types import AudioCodec, Container, Encoder, Resolution, SubtitleBurnMethod, VideoCodec
 from ffclipper.models.verbosity import Verbosity
 
 from .audio import AudioOptions
@@ -29,6 +31,22 @@ from .subtitles import SubtitlesOptions
 from .time import TimeOptions
 from .video import VideoOptions
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+_REMOTE_PREFIXES = ("http://", "https://")  #: Source prefixes treated as remote URLs.
+
+# Exact-type converters for option values rendered by ``to_cli_args``.
+_CLI_VALUE_CONVERTERS: dict[type, Callable[[Any], str]] = {
+    Path: str,
+    type(Path()): str,
+    Verbosity: lambda v: v.name.lower(),
+    **dict.fromkeys(
+        (Container, Encoder, Resolution, SubtitleBurnMethod, VideoCodec),
+        lambda v: str(v.value),
+    ),
+}
+
 
 @Parameter(name="*")
 class Options(BaseModel):
@@ -81,8 +99,7 @@ class Options(BaseModel):
             if not path.is_file():
                 raise ValueError(f"Input path is not a file: {path}")
             return path
-        parsed = urlparse(v)
-        if parsed.scheme in {"http", "https"}:
+        if v[:8].lower().startswith(_REMOTE_PREFIXES):
             return v
         path = Path(v).expanduser().absolute()
         if not path.is_file():
@@ -255,21 +272,23 @@ class Options(BaseModel):
 
     def to_cli_args(self, *, suppress_output: bool = False, baseline: Options | None = None) -> list[str]:
         """Return CLI argument list representing this option set."""
-        baseline_opts = baseline or self.defaults_for_gui()
-        args: list[str] = ["--source", str(self.source)]
+        default_map = self._default_flat() if baseline is None else dict(self._flatten_dict(baseline.model_dump()))
         flat_actual = self._flatten_dict(self.model_dump())
-        flat_defaults = self._flatten_dict(baseline_opts.model_dump())
-        for key, value in self._diff_pairs(flat_defaults, flat_actual):
-            if suppress_output and key == "output":
-                continue
-            cli_key = self._to_cli_key(key)
-            if isinstance(value, bool):
-                args.append(f"--{cli_key}" if value else f"--{self._negate(cli_key)}")
-                continue
-            if value is None:
-                continue
-            args.extend([f"--{cli_key}", self._to_cli_value(value)])
-        return args
+        tokens = (
+            self._to_cli_tokens(key, value)
+            for key, value in self._diff_pairs(default_map, flat_actual)
+            if not (suppress_output and key == "output")
+        )
+        return ["--source", str(self.source), *chain.from_iterable(tokens)]
+
+    @classmethod
+    def _to_cli_tokens(cls, key: str, value: object) -> tuple[str, ...]:
+        cli_key = cls._to_cli_key(key)
+        if isinstance(value, bool):
+            return (f"--{cli_key}" if value else f"--{cls._negate(cli_key)}",)
+        if value is None:
+            return ()
+        return (f"--{cli_key}", cls._to_cli_value(value))
 
     @classmethod
     def _flatten_dict(cls, data: dict[str, object], prefix: str | None = None) -> list[tuple[str, object]]:
@@ -283,8 +302,7 @@ class Options(BaseModel):
         return items
 
     @staticmethod
-    def _diff_pairs(defaults: list[tuple[str, object]], actual: list[tuple[str, object]]) -> list[tuple[str, object]]:
-        default_map = dict(defaults)
+    def _diff_pairs(default_map: Mapping[str, object], actual: list[tuple[str, object]]) -> list[tuple[str, object]]:
         result: list[tuple[str, object]] = []
         for key, value in actual:
             if key == "source":
@@ -305,8 +323,9 @@ class Options(BaseModel):
 
     @staticmethod
     def _to_cli_value(value: object) -> str:
-        if isinstance(value, Path):
-            return str(value)
+        convert = _CLI_VALUE_CONVERTERS.get(type(value))
+        if convert is not None:
+            return convert(value)
         if isinstance(value, IntEnum):
             return value.name.lower()
         if isinstance(value, Enum):
@@ -339,6 +358,16 @@ class Options(BaseModel):
             opts.subtitles.delay = DEFAULT_SUBTITLE_DELAY
         return opts
 
+    @classmethod
+    @cache
+    def _default_flat(cls) -> MappingProxyType[str, object]:
+        """Return the flattened GUI defaults used as the ``to_cli_args`` baseline.
+
+        Built once per process so serializing options does not allocate a
+        throwaway ``Options`` tree on every call.
+        """
+        return MappingProxyType(dict(cls._flatten_dict(cls.defaults_for_gui().model_dump())))
+
     @classmethod
     def supports_subtitle_copying(cls, container: Container) -> bool:
         """Check if container supports subtitle streams in any form."""
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from contextlib import suppress
 from typing import Annotated
 
 from cyclopts import Parameter
@@ -12,6 +13,9 @@ from ffclipper.models.verbosity import Verbosity
 
 from .groups import RUNTIME_GROUP
 
+# Lowercase names and integer values mapped to their canonical members.
+_VERBOSITY_LOOKUP: dict[str | int, Verbosity] = {int(v): v for v in Verbosity} | {v.name.lower(): v for v in Verbosity}
+
 
 @Parameter(group=RUNTIME_GROUP)
 class RuntimeOptions(BaseModel):
@@ -26,6 +30,11 @@ class RuntimeOptions(BaseModel):
         bool,
         EnableWhen("runtime.dry_run", value=False),
     ] = Field(default=True, description="Open the output directory when done.")
+    max_probes: int | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum concurrent ffprobe processes. [default: FFCLIPPER_MAX_PROBES or the CPU count]",
+    )
 
     @field_validator("verbosity", mode="before")
     @classmethod
@@ -35,19 +44,16 @@ class RuntimeOptions(BaseModel):
         Allows CLI usage like ``--runtime.verbosity commands`` in addition to
         ``--runtime.verbosity 1``.
         """
-        if isinstance(v, Verbosity):
-            return v
-        if isinstance(v, int):
-            return Verbosity(v)
+        key: str | int | None = None
         if isinstance(v, str):
-            token = v.strip()
-            try:
-                return Verbosity[token.upper()]
-            except KeyError:
-                try:
-                    return Verbosity(int(token))
-                except (ValueError, KeyError):
-                    pass
+            key = v.strip().lower()
+            # Digit strings go through int() so padded forms like "01" still parse.
+            with suppress(ValueError):
+                key = int(key)
+        elif isinstance(v, int):  # Verbosity members and plain ints; floats are rejected
+            key = int(v)
+        if key is not None and (result := _VERBOSITY_LOOKUP.get(key)) is not None:
+            return result
         raise ValueError("verbosity must be one of quiet, commands, output, or 0/1/2")
 
 
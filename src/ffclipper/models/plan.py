@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -17,6 +18,7 @@ AUTO_EXTRACT_RATIO_THRESHOLD = 0.25  #: Max clip/source duration ratio for auto
 
 if TYPE_CHECKING:
     from .context import RuntimeContext
+    from .ffprobe import ProbeInfo
 
 
 @dataclass(slots=True)
@@ -42,10 +44,18 @@ class ClipPlan:
     @classmethod
     def from_options(cls, opts: Options, ctx: RuntimeContext) -> ClipPlan:
         """Create a plan from raw options."""
-        _ensure_tools(ctx, opts)
-
         src_val = str(opts.source)
-        video_duration = _probe_duration(ctx, src_val)
+        # A missing ffmpeg/ffprobe fails before any source probe is spawned.
+        _ensure_tools(ctx)
+        # Encoder discovery and the source probe are independent subprocess
+        # work; run them together. The encoder task is listed first so its error wins.
+        info = probe.batch(
+            {
+                "encoder": partial(_ensure_encoder, ctx, opts),
+                "info": partial(probe.get_full_info, ctx, src_val),
+            }
+        )["info"]
+        video_duration = _probe_duration(info, src_val)
         start_ms, duration_ms = compute_time_bounds(opts, video_duration)
         need_trim = any([opts.time.start_ms, opts.time.end_ms, opts.time.duration_ms])
         if not need_trim:
@@ -55,7 +65,7 @@ class ClipPlan:
         container = opts.container if opts.container is not None else DEFAULT_CONTAINER
         output_path = derive_output_path(src_val, opts.output, container)
 
-        video_codec, audio_codec = _validate_container(opts, ctx)
+        video_codec, audio_codec = _validate_container(opts, info)
 
         burn = opts.subtitles.burn if opts.should_burn_subtitles() else None
         method = opts.subtitles.burn_method
@@ -72,7 +82,7 @@ class ClipPlan:
             method = None
             delay = None
         copy_subs = opts.should_copy_subtitles()
-        tonemap = _should_tonemap(ctx, opts)
+        tonemap = _should_tonemap(opts, info)
 
         return cls(
             opts=opts,
@@ -93,14 +103,23 @@ class ClipPlan:
         )
 
 
-def _ensure_tools(ctx: RuntimeContext, opts: Options) -> None:
-    """Validate that ffmpeg, ffprobe, and the selected encoder are available."""
+def _ensure_tools(ctx: RuntimeContext) -> None:
+    """Validate that ffmpeg and ffprobe are available, once per context."""
+    if ctx.tools_validated:
+        return
     try:
         check_ffmpeg_version(ctx)
         probe.check_version(ctx)
     except (OSError, RuntimeError) as e:  # pragma: no cover - environment dependent
         raise ValueError(str(e)) from e
+    ctx.tools_validated = True
+
+
+def _ensure_encoder(ctx: RuntimeContext, opts: Options) -> None:
+    """Validate the selected encoder, resolving ``AUTO`` from the available ones.
 
+    Unlike the version checks this always runs, because it depends on ``opts``.
+    """
     if not opts.video.copy:
         avail = available_encoders(ctx)
         if opts.video.encoder in {None, Encoder.AUTO}:
@@ -116,15 +135,15 @@ def _ensure_tools(ctx: RuntimeContext, opts: Options) -> None:
             opts.video.codec = encoder.codec
 
 
-def _probe_duration(ctx: RuntimeContext, source: str) -> float:
-    """Return the duration of ``source`` in seconds."""
-    dur = probe.get_video_duration_sec(ctx, source)
+def _probe_duration(info: ProbeInfo | None, source: str) -> float:
+    """Return the probed duration of ``source`` in seconds."""
+    dur = info.duration_sec if info else None
     if dur is None:
         raise ValueError(f"Could not read video duration from: {source}")
     return dur
 
 
-def _validate_container(opts: Options, ctx: RuntimeContext) -> tuple[VideoCodec | None, AudioCodec | None]:
+def _validate_container(opts: Options, info: ProbeInfo | None) -> tuple[VideoCodec | None, AudioCodec | None]:
     """Resolve probed codecs and record output codecs.
 
     Behavior for stream copy:
@@ -140,10 +159,9 @@ def _validate_container(opts: Options, ctx: RuntimeContext) -> tuple[VideoCodec
     """
     video_codec: VideoCodec | None
     if opts.video.copy:
-        # Probe and coerce to our enum if possible; otherwise leave as None and
+        # Coerce the probed codec to our enum if possible; otherwise leave as None and
         # allow ffmpeg to attempt pass-through regardless of container.
-        info = probe.get_video_codec(ctx, str(opts.source))
-        codec_name = info.codec if info else None
+        codec_name = info.video.codec if info and info.video else None
         try:
             video_codec = VideoCodec(codec_name) if codec_name else None
         except ValueError:
@@ -157,10 +175,9 @@ def _validate_container(opts: Options, ctx: RuntimeContext) -> tuple[VideoCodec
     audio_codec: AudioCodec | None = None
     if opts.audio.include:
         if opts.audio.copy:
-            # Probe and coerce to our enum if possible; otherwise leave as None
+            # Coerce the probed codec to our enum if possible; otherwise leave as None
             # and allow ffmpeg to attempt pass-through regardless of container.
-            info = probe.get_audio_codec(ctx, str(opts.source))
-            codec_name = info.codec if info else None
+            codec_name = info.audio.codec if info and info.audio else None
             try:
                 audio_codec = AudioCodec(codec_name) if codec_name else None
             except ValueError:
@@ -172,7 +189,7 @@ def _validate_container(opts: Options, ctx: RuntimeContext) -> tuple[VideoCodec
     return video_codec, audio_codec
 
 
-def _should_tonemap(ctx: RuntimeContext, opts: Options) -> bool:
+def _should_tonemap(opts: Options, info: ProbeInfo | None) -> bool:
     """Determine if tonemapping is required for the planned conversion."""
     if opts.video.copy:
         return False
@@ -181,8 +198,8 @@ def _should_tonemap(ctx: RuntimeContext, opts: Options) -> bool:
         raise ValueError("encoder not set")
     if encoder.codec.supports_hdr:
         return False
-    info = probe.get_video_color_info(ctx, str(opts.source))
-    return bool(info and info.transfer and info.transfer.is_hdr)
+    color = info.color if info else None
+    return bool(color and color.transfer and color.transfer.is_hdr)
 
 
 def derive_output_path(source: str | Path, output: Path | None, container: Container) -> Path:
@@ -193,22 +210,24 @@ def derive_output_path(source: str | Path, output: Path | None, container: Conta
     """
     if output:
         p = Path(output)
+        # Only a leading "~" is ever expanded, so skip the lookup for other paths.
+        if str(p).startswith("~"):
+            p = p.expanduser()
         if not p.suffix:
-            p = p.with_suffix(f".{container.value}")
-        return p.expanduser().absolute()
-
-    src_val = str(source)
-    parsed = urlparse(src_val)
-    is_url = parsed.scheme in {"http", "https"}
-    if is_url:
-        name = Path(parsed.path).name
-        if not name:
-            # Fallback: keep as current working directory with generic name
-            # The GUI will avoid deriving in this case; keep logic safe here.
-            raise ValueError("Cannot derive output filename from URL; please provide --output")
-        p = Path.cwd() / f"{Path(name).stem}{CLIP_SUFFIX}.{container.value}"
-        return p.expanduser().absolute()
-
-    src = Path(src_val).expanduser()
-    p = src.parent / f"{src.stem}{CLIP_SUFFIX}.{container.value}"
-    return p.expanduser().absolute()
+            p = p.with_suffix(container.extension)
+    else:
+        src_val = str(source)
+        if src_val[:8].lower().startswith(("http://", "https://")):
+            name = Path(urlparse(src_val).path).name
+            if not name:
+                # Fallback: keep as current working directory with generic name
+                # The GUI will avoid deriving in this case; keep logic safe here.
+                raise ValueError("Cannot derive output filename from URL; please provide --output")
+            # Anchor on the cwd so a URL name such as "~clip" is never expanded.
+            p = Path.cwd() / f"{Path(name).stem}{CLIP_SUFFIX}{container.extension}"
+        else:
+            src = Path(src_val)
+            if src_val.startswith("~"):
+                src = src.expanduser()
+            p = src.parent / f"{src.stem}{CLIP_SUFFIX}{container.extension}"
+    return p.absolute()
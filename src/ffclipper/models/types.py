@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 
 
 class VideoCodec(str, Enum):
@@ -19,7 +20,7 @@ class VideoCodec(str, Enum):
         return self in HDR_CAPABLE_CODECS
 
 
-HDR_CAPABLE_CODECS: set[VideoCodec] = {VideoCodec.HEVC, VideoCodec.AV1, VideoCodec.VP9}
+HDR_CAPABLE_CODECS: frozenset[VideoCodec] = frozenset({VideoCodec.HEVC, VideoCodec.AV1, VideoCodec.VP9})
 
 
 class AudioCodec(str, Enum):
@@ -63,7 +64,10 @@ class ColorTransfer(str, Enum):
     @property
     def is_hdr(self) -> bool:
         """Whether this transfer represents HDR content."""
-        return self in {ColorTransfer.PQ, ColorTransfer.HLG}
+        return self in HDR_TRANSFERS
+
+
+HDR_TRANSFERS: frozenset[ColorTransfer] = frozenset({ColorTransfer.PQ, ColorTransfer.HLG})
 
 
 class Encoder(str, Enum):
@@ -79,27 +83,32 @@ class Encoder(str, Enum):
     @property
     def ffmpeg_name(self) -> str:
         """Return the FFmpeg encoder name for this enum."""
-        return {
-            Encoder.X264: "libx264",
-            Encoder.X265: "libx265",
-            Encoder.H264_NVENC: "h264_nvenc",
-            Encoder.HEVC_NVENC: "hevc_nvenc",
-            Encoder.SVT_AV1: "libsvtav1",
-            Encoder.AUTO: "auto",
-        }[self]
+        return _ENCODER_FFMPEG_NAMES[self]
 
     @property
     def codec(self) -> VideoCodec:
         """Video codec produced by this encoder."""
         if self is Encoder.AUTO:
             raise ValueError("AUTO encoder has no codec")
-        return {
-            Encoder.X264: VideoCodec.H264,
-            Encoder.X265: VideoCodec.HEVC,
-            Encoder.H264_NVENC: VideoCodec.H264,
-            Encoder.HEVC_NVENC: VideoCodec.HEVC,
-            Encoder.SVT_AV1: VideoCodec.AV1,
-        }[self]
+        return _ENCODER_CODECS[self]
+
+
+_ENCODER_FFMPEG_NAMES: dict[Encoder, str] = {
+    Encoder.X264: "libx264",
+    Encoder.X265: "libx265",
+    Encoder.H264_NVENC: "h264_nvenc",
+    Encoder.HEVC_NVENC: "hevc_nvenc",
+    Encoder.SVT_AV1: "libsvtav1",
+    Encoder.AUTO: "auto",
+}
+
+_ENCODER_CODECS: dict[Encoder, VideoCodec] = {
+    Encoder.X264: VideoCodec.H264,
+    Encoder.X265: VideoCodec.HEVC,
+    Encoder.H264_NVENC: VideoCodec.H264,
+    Encoder.HEVC_NVENC: VideoCodec.HEVC,
+    Encoder.SVT_AV1: VideoCodec.AV1,
+}
 
 
 class Resolution(str, Enum):
@@ -140,46 +149,54 @@ class Container(str, Enum):
 class ContainerCompatibility:
     """Capabilities supported by an output container."""
 
-    video_codecs: set[VideoCodec]
-    audio_codecs: set[AudioCodec]
-    subtitle_codecs: set[SubtitleCodec]
-
-
-_CONTAINER_COMPATIBILITY: dict[Container, ContainerCompatibility] = {
-    Container.MKV: ContainerCompatibility(
-        video_codecs={
-            VideoCodec.H264,
-            VideoCodec.HEVC,
-            VideoCodec.AV1,
-            VideoCodec.VP9,
-            VideoCodec.MPEG4,
-        },
-        audio_codecs={
-            AudioCodec.AAC,
-            AudioCodec.MP3,
-            AudioCodec.AC3,
-            AudioCodec.EAC3,
-            AudioCodec.DTS,
-            AudioCodec.FLAC,
-            AudioCodec.OPUS,
-            AudioCodec.VORBIS,
-        },
-        subtitle_codecs={
-            SubtitleCodec.SRT,
-            SubtitleCodec.ASS,
-            SubtitleCodec.SSA,
-            SubtitleCodec.PGS,
-            SubtitleCodec.VOBSUB,
-        },
-    ),
-    Container.MP4: ContainerCompatibility(
-        video_codecs={VideoCodec.H264, VideoCodec.HEVC, VideoCodec.AV1},
-        audio_codecs={AudioCodec.AAC, AudioCodec.MP3, AudioCodec.AC3},
-        subtitle_codecs={SubtitleCodec.MOV_TEXT},
-    ),
-    Container.WEBM: ContainerCompatibility(
-        video_codecs={VideoCodec.VP9, VideoCodec.AV1},
-        audio_codecs={AudioCodec.OPUS, AudioCodec.VORBIS},
-        subtitle_codecs=set(),
-    ),
-}
+    video_codecs: frozenset[VideoCodec]
+    audio_codecs: frozenset[AudioCodec]
+    subtitle_codecs: frozenset[SubtitleCodec]
+
+
+_CONTAINER_COMPATIBILITY: MappingProxyType[Container, ContainerCompatibility] = MappingProxyType(
+    {
+        Container.MKV: ContainerCompatibility(
+            video_codecs=frozenset(
+                {
+                    VideoCodec.H264,
+                    VideoCodec.HEVC,
+                    VideoCodec.AV1,
+                    VideoCodec.VP9,
+                    VideoCodec.MPEG4,
+                }
+            ),
+            audio_codecs=frozenset(
+                {
+                    AudioCodec.AAC,
+                    AudioCodec.MP3,
+                    AudioCodec.AC3,
+                    AudioCodec.EAC3,
+                    AudioCodec.DTS,
+                    AudioCodec.FLAC,
+                    AudioCodec.OPUS,
+                    AudioCodec.VORBIS,
+                }
+            ),
+            subtitle_codecs=frozenset(
+                {
+                    SubtitleCodec.SRT,
+                    SubtitleCodec.ASS,
+                    SubtitleCodec.SSA,
+                    SubtitleCodec.PGS,
+                    SubtitleCodec.VOBSUB,
+                }
+            ),
+        ),
+        Container.MP4: ContainerCompatibility(
+            video_codecs=frozenset({VideoCodec.H264, VideoCodec.HEVC, VideoCodec.AV1}),
+            audio_codecs=frozenset({AudioCodec.AAC, AudioCodec.MP3, AudioCodec.AC3}),
+            subtitle_codecs=frozenset({SubtitleCodec.MOV_TEXT}),
+        ),
+        Container.WEBM: ContainerCompatibility(
+            video_codecs=frozenset({VideoCodec.VP9, VideoCodec.AV1}),
+            audio_codecs=frozenset({AudioCodec.OPUS, AudioCodec.VORBIS}),
+            subtitle_codecs=frozenset(),
+        ),
+    }
+)
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import re
+import shutil
 import subprocess
+from functools import cache, partial
 from typing import TYPE_CHECKING
 
 from ffclipper.models.types import Encoder, VideoCodec
@@ -12,10 +15,28 @@ from .cli import cache_key, run_ffmpeg
 if TYPE_CHECKING:
     from ffclipper.models.context import RuntimeContext
 
+#: Encoders whose presence in ``ffmpeg -encoders`` does not prove they work (driver/GPU dependent).
+HARDWARE_ENCODERS: frozenset[Encoder] = frozenset({Encoder.H264_NVENC, Encoder.HEVC_NVENC})
+
+_LIST_ENCODERS_ARGS = ["-hide_banner", "-encoders"]
+_ENCODER_LINE_RE = re.compile(r"^ [VAS][.A-Z]{5} (\S+)", re.MULTILINE)
+
+
+@cache
+def _ffmpeg_executable() -> str:
+    """Return the resolved ``ffmpeg`` path, or the bare name if not on ``PATH``."""
+    return shutil.which("ffmpeg") or "ffmpeg"
+
 
 def _ffmpeg_supports(ctx: RuntimeContext, args: list[str]) -> bool:
-    """Run ``ffmpeg`` and cache whether the command succeeds."""
-    key = cache_key(["ffmpeg", *args])
+    """Run ``ffmpeg`` and cache whether the command succeeds.
+
+    ``ctx.cache`` lives on disk, so results survive across runs. Keying on the
+    resolved executable folds its mtime and size into the key (see
+    :func:`cache_key`), which invalidates stale entries when ffmpeg is
+    upgraded or replaced.
+    """
+    key = cache_key([_ffmpeg_executable(), *args])
     cached = ctx.cache.get(key)
     if isinstance(cached, bool):
         return cached
@@ -28,6 +49,22 @@ def _ffmpeg_supports(ctx: RuntimeContext, args: list[str]) -> bool:
     return True
 
 
+def _builtin_encoders(ctx: RuntimeContext) -> frozenset[str] | None:
+    """Return encoder names compiled into ``ffmpeg``, or ``None`` if listing fails."""
+    key = cache_key([_ffmpeg_executable(), *_LIST_ENCODERS_ARGS])
+    cached = ctx.cache.get(key)
+    if isinstance(cached, frozenset):
+        return cached
+    try:
+        out = run_ffmpeg(_LIST_ENCODERS_ARGS)
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    # The legend above the "------" rule uses the same flag layout; skip it.
+    names = frozenset(_ENCODER_LINE_RE.findall(out.partition("------")[2]))
+    ctx.cache[key] = names
+    return names
+
+
 def _check_encoder(ctx: RuntimeContext, encoder: Encoder) -> bool:
     """Return True if ``encoder`` can encode a tiny sample."""
     args = [
@@ -51,8 +88,30 @@ def _check_encoder(ctx: RuntimeContext, encoder: Encoder) -> bool:
 
 
 def available_encoders(ctx: RuntimeContext) -> set[Encoder]:
-    """Return the set of encoders that are usable on this system."""
-    return {e for e in Encoder if e is not Encoder.AUTO and _check_encoder(ctx, e)}
+    """Return the set of encoders that are usable on this system.
+
+    A single ``ffmpeg -encoders`` listing rules out encoders that are not
+    compiled in and confirms the software ones. Hardware encoders can be
+    listed yet unusable without a suitable device, so each remaining one is
+    probed by its own ``ffmpeg`` process; the probes run concurrently. If the
+    listing fails, every candidate is probed.
+    """
+    candidates = [e for e in Encoder if e is not Encoder.AUTO]
+    builtin = _builtin_encoders(ctx)
+    if builtin is None:
+        trial = candidates
+        found: set[Encoder] = set()
+    else:
+        listed = [e for e in candidates if e.ffmpeg_name in builtin]
+        trial = [e for e in listed if e in HARDWARE_ENCODERS]
+        found = {e for e in listed if e not in HARDWARE_ENCODERS}
+    if trial:
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415 - only needed when trials run
+
+        with ThreadPoolExecutor(max_workers=len(trial)) as pool:
+            supported = pool.map(partial(_check_encoder, ctx), trial)
+        found.update(e for e, ok in zip(trial, supported, strict=True) if ok)
+    return found
 
 
 PREFERRED_ENCODERS: dict[VideoCodec, tuple[Encoder, ...]] = {
@@ -3,15 +3,16 @@
 import logging
 import os
 import shlex
+import stat
 import subprocess
 from collections.abc import Callable, Sequence
-from functools import partial
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from ffclipper.models.context import RuntimeContext
 
-from .helpers import emit_status
+from .helpers import status_emitter
 
 _FFMPEG = "ffmpeg"
 _FFPROBE = "ffprobe"
@@ -20,62 +21,128 @@ _FFMPEG_VERSION_KEY = "__ffmpeg_version__"
 
 _VIDEO_FILTER = "-vf"
 
+_READ_SIZE = 1 << 16  #: Bytes requested per read when streaming subprocess output.
+
 logger = logging.getLogger(__name__)
 
 
-def cache_key(cmd: Sequence[str | Path]) -> tuple[Any, ...]:
-    """Return a cache key for ``cmd`` based on tokens and file metadata."""
+type FileStamp = tuple[int, int] | None  #: ``(mtime_ns, size)`` of a regular file, or ``None``.
+
+
+def _file_stamp(s: str) -> FileStamp:
+    """Return ``(mtime_ns, size)`` when ``s`` names a regular file."""
+    try:
+        st = Path(s).stat()
+    except (OSError, ValueError):
+        # Missing, unreadable, or not a valid path; skip metadata defensively
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _may_be_path(s: str) -> bool:
+    """Cheaply reject tokens that cannot name an input file (flags, formats, pipes)."""
+    if not s or s[0] == "-" or s.startswith("pipe:"):
+        return False
+    return "/" in s or "\\" in s or "." in s
+
+
+def cache_key(cmd: Sequence[str | Path], *, stat_cache: dict[str, FileStamp] | None = None) -> tuple[Any, ...]:
+    """Return a cache key for ``cmd`` based on tokens and file metadata.
+
+    Callers issuing several commands against the same files can pass a
+    ``stat_cache`` dict to reuse file metadata instead of hitting the
+    filesystem for every key. Only share one across commands that run while
+    the files are known not to change.
+    """
+    tokens, path_tokens = _split_cmd_tokens(tuple(cmd))
+    if not path_tokens:
+        return tokens
     key_parts: list[Any] = []
-    for token in cmd:
-        s = str(token)
-        key_parts.append(s)
-        if s.startswith("-"):
-            continue
-        path = Path(s)
-        if path.is_file():
-            try:
-                stat = path.stat()
-            except OSError:
-                # File might disappear or be unreadable; skip metadata defensively
-                continue
-            key_parts.extend([int(stat.st_mtime_ns), stat.st_size])
+    start = 0
+    for i in path_tokens:
+        key_parts.extend(tokens[start : i + 1])
+        start = i + 1
+        s = tokens[i]
+        if stat_cache is None:
+            stamp = _file_stamp(s)
+        elif s in stat_cache:
+            stamp = stat_cache[s]
+        else:
+            stamp = stat_cache[s] = _file_stamp(s)
+        if stamp is not None:
+            key_parts.extend(stamp)
+    key_parts.extend(tokens[start:])
     return tuple(key_parts)
 
 
+@lru_cache(maxsize=4096)
+def _split_cmd_tokens(cmd: tuple[str | Path, ...]) -> tuple[tuple[str, ...], tuple[int, ...]]:
+    """Return ``cmd`` as strings plus the indices of tokens that may name files.
+
+    This is the part of :func:`cache_key` that depends only on the command, so
+    it is memoized; file metadata is always read fresh.
+    """
+    tokens = tuple(str(token) for token in cmd)
+    return tokens, tuple(i for i, s in enumerate(tokens) if _may_be_path(s))
+
+
+def _log_segments(text: str, log: Callable[[str], None]) -> str:
+    r"""Log complete output segments in ``text`` and return the unterminated tail.
+
+    ``\n`` ends a line; a bare ``\r`` ends an in-place progress update, which
+    is forwarded with its ``\r`` so terminals can overwrite the line.
+    """
+    *lines, tail = text.replace("\r\n", "\n").split("\n")
+    for line in lines:
+        *updates, last = line.split("\r")
+        for update in updates:
+            log(update + "\r")
+        log(last)
+    *updates, tail = tail.split("\r")
+    for update in updates:
+        log(update + "\r")
+    return tail
+
+
 def _run_streaming(
     cmd: list[str],
     *,
     creationflags: int,
     log: Callable[[str], None],
 ) -> str:
-    """Run a command, streaming combined stdout/stderr and returning output."""
+    """Run a command, streaming combined stdout/stderr and returning output.
+
+    Output is read in large unbuffered blocks rather than line by line; the
+    returned text uses universal newlines, as with ``text=True``.
+    """
     with subprocess.Popen(  # noqa: S603
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        bufsize=0,
         creationflags=creationflags,
     ) as p:
-        output_chunks: list[str] = []
+        blocks: list[bytes] = []
         if p.stdout is None:  # pragma: no cover - defensive
             raise RuntimeError("Failed to capture subprocess stdout")
-        buf = ""
-        for line in iter(p.stdout.readline, ""):
-            output_chunks.append(line)
-            parts = line.split("\r")
-            buf += parts[0]
-            for part in parts[1:]:
-                log(buf + "\r")
-                buf = part
-            if buf.endswith("\n"):
-                log(buf[:-1])
-                buf = ""
-        if buf:
-            log(buf)
-            buf = ""
+        fd = p.stdout.fileno()
+        tail = b""
+        while chunk := os.read(fd, _READ_SIZE):
+            blocks.append(chunk)
+            data = tail + chunk
+            # Split after the last terminator, holding back a trailing "\r"
+            # that may be the first half of "\r\n". Terminators are ASCII, so
+            # the split never lands inside a multi-byte UTF-8 sequence.
+            end = max(data.rfind(b"\n"), data.rfind(b"\r", 0, len(data) - 1)) + 1
+            if end:
+                _log_segments(data[:end].decode("utf-8", "replace"), log)
+            tail = data[end:]
+        if tail and (rest := _log_segments(tail.decode("utf-8", "replace"), log)):
+            log(rest)
         p.wait()
-        output = "".join(output_chunks)
+        output = b"".join(blocks).decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
         if p.returncode:
             raise subprocess.CalledProcessError(p.returncode or 1, cmd, output)
         return output
@@ -96,13 +163,14 @@ def run(
     output and return it after completion.
     """
     cmd = [str(exe), *[str(a) for a in args]]
+    emit = status_emitter(status_callback)
 
     def log(message: str, *, debug: bool = False) -> None:
         if debug:
             # Debug output never goes to the status callback; keep it in logs.
             logger.debug(message)
         else:
-            emit_status(message, status_callback=status_callback)
+            emit(message)
 
     # Only emit a one-line banner when explicitly requested via list_cmd.
     # Verbose mode streams the tool's own output and does not need a banner here,
@@ -116,20 +184,43 @@ def run(
     if verbose:
         return _run_streaming(cmd, creationflags=creationflags, log=log)
 
-    # Non-verbose: capture output and return.
+    # Non-verbose: capture raw bytes and decode once, as the streaming path
+    # does, instead of going through the io text layer.
     proc = subprocess.run(  # noqa: S603
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
         creationflags=creationflags,
-        check=True,
+        check=False,
     )
-    return proc.stdout
+    output = proc.stdout.decode("utf-8", "replace")
+    if "\r" in output:
+        output = output.replace("\r\n", "\n").replace("\r", "\n")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output)
+    return output
 
 
-run_ffmpeg = partial(run, _FFMPEG)
-run_ffprobe = partial(run, _FFPROBE)
+def run_ffmpeg(
+    args: Sequence[str | Path],
+    *,
+    verbose: bool = False,
+    status_callback: Callable[[str], None] | None = None,
+    list_cmd: bool = False,
+) -> str:
+    """Run ``ffmpeg`` with ``args``; see :func:`run`."""
+    return run(_FFMPEG, args, verbose=verbose, status_callback=status_callback, list_cmd=list_cmd)
+
+
+def run_ffprobe(
+    args: Sequence[str | Path],
+    *,
+    verbose: bool = False,
+    status_callback: Callable[[str], None] | None = None,
+    list_cmd: bool = False,
+) -> str:
+    """Run ``ffprobe`` with ``args``; see :func:`run`."""
+    return run(_FFPROBE, args, verbose=verbose, status_callback=status_callback, list_cmd=list_cmd)
 
 
 def _get_version(run_func: Callable[[Sequence[str | Path]], str], name: str) -> str:
@@ -168,6 +259,7 @@ def check_ffmpeg_version(ctx: RuntimeContext) -> str:
     return version
 
 
+@lru_cache(maxsize=4096)
 def quote_arg(arg: str, *, force: bool = False) -> str:
     """Quote argument if needed."""
     if os.name == "nt":
@@ -184,7 +276,8 @@ def quote_arg(arg: str, *, force: bool = False) -> str:
 def join_command(exe: str | Path, args: Sequence[str | Path]) -> str:
     """Format a command for display."""
     parts = [str(exe), *[str(a) for a in args]]
-    return " ".join(quote_arg(part, force=i > 0 and parts[i - 1] == _VIDEO_FILTER) for i, part in enumerate(parts))
+    forced = [False, *[prev == _VIDEO_FILTER for prev in parts[:-1]]]
+    return " ".join(quote_arg(part, force=force) for part, force in zip(parts, forced, strict=True))
 
 
 def format_ffmpeg_cmd(args: Sequence[str | Path]) -> str:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import math
+import re
 from pathlib import PureWindowsPath
 from typing import TYPE_CHECKING, Literal
 
@@ -14,12 +15,18 @@ else:
 
     Callable = abc.Callable
 
-from pytimeparse2 import parse as parse_duration
-
 from ffclipper.models.verbosity import Verbosity
 
 logger = logging.getLogger(__name__)
 
+# Fast paths for the common timespan shapes; anything else goes to pytimeparse2.
+_CLOCK_RE = re.compile(r"\s*(?:(?P<h>\d+):(?=\d{2}:))?(?P<m>\d{1,2}):(?P<s>\d{2}(?:\.\d+)?)\s*")
+_UNIT_RE = re.compile(r"\s*(?P<v>\d+(?:\.\d+)?)\s*(?P<unit>ms|s|m|h)?\s*")
+_UNIT_SECONDS = {None: 1, "ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+# Single-pass escaping for paths embedded in filter arguments.
+_FILTER_PATH_ESCAPES = str.maketrans({":": r"\:", "'": r"\\'"})
+
 
 def parse_timespan_to_ms(s: str | None) -> int | None:
     """Convert a time string to milliseconds.
@@ -37,6 +44,14 @@ def parse_timespan_to_ms(s: str | None) -> int | None:
     """
     if not s:
         return None
+    if match := _CLOCK_RE.fullmatch(s):
+        h, m, sec = match.group("h", "m", "s")
+        return round((int(h or 0) * 3600 + int(m) * 60 + float(sec)) * 1000)
+    if match := _UNIT_RE.fullmatch(s):
+        return round(float(match["v"]) * _UNIT_SECONDS[match["unit"]] * 1000)
+    # pytimeparse2 costs several ms to import, so only load it for the unusual shapes.
+    from pytimeparse2 import parse as parse_duration  # noqa: PLC0415
+
     parsed = parse_duration(s)
     if parsed is None:
         raise ValueError(f"Unable to parse timespan: {s}")
@@ -45,8 +60,7 @@ def parse_timespan_to_ms(s: str | None) -> int | None:
 
 def escape_filter_path_for_windows(path: str) -> str:
     """Normalize and escape Windows path for FFmpeg filters."""
-    posix_path = PureWindowsPath(path).as_posix()
-    return posix_path.replace(":", r"\:").replace("'", r"\\'")
+    return PureWindowsPath(path).as_posix().translate(_FILTER_PATH_ESCAPES)
 
 
 def format_time(
@@ -58,15 +72,18 @@ def format_time(
     """Format seconds as ``HH:MM:SS.F`` with configurable precision."""
     q = 10**places
     if mode == "ceil":
-        seconds = math.ceil(seconds * q) / q
+        ticks = math.ceil(seconds * q)
     elif mode == "floor":
-        seconds = math.floor(seconds * q) / q
+        ticks = math.floor(seconds * q)
     else:
-        seconds = round(seconds, places)
+        ticks = round(round(seconds, places) * q)
 
-    h, remainder = divmod(seconds, 3600)
-    m, s = divmod(remainder, 60)
-    return f"{int(h):02d}:{int(m):02d}:{s:0{2 + 1 + places}.{places}f}"
+    m, s_ticks = divmod(ticks, 60 * q)
+    h, m = divmod(m, 60)
+    whole, frac = divmod(s_ticks, q)
+    if not places:
+        return f"{h:02d}:{m:02d}:{whole:02d}"
+    return f"{h:02d}:{m:02d}:{whole:02d}.{frac:0{places}d}"
 
 
 def emit_status(message: str, *, status_callback: Callable[[str], None] | None) -> None:
@@ -79,19 +96,41 @@ def emit_status(message: str, *, status_callback: Callable[[str], None] | None)
     * Any other ``Callable[[str], None]`` - for GUIs or tests that capture
       status output.
     """
+    status_emitter(status_callback)(message)
+
+
+def status_emitter(status_callback: Callable[[str], None] | None) -> Callable[[str], None]:
+    """Return the function ``emit_status`` would dispatch to for ``status_callback``.
+
+    Resolve this once before emitting many lines, such as streamed tool output.
+    """
     if status_callback is None:
-        logger.info(message)
-        return
+        return _log_status
     # Special handling for terminal-friendly in-place updates.
     if status_callback is print:
-        print(  # noqa: T201
-            message,
-            end="" if "\r" in message and "\n" not in message else "\n",
-            flush=True,
-        )
-        return
-    # Generic callback path.
-    status_callback(message)
+        return _print_status
+    # Generic callback path; in-place ``\r`` markers only mean something to a terminal.
+    callback = status_callback
+
+    def _emit(message: str) -> None:
+        callback(message.removesuffix("\r"))
+
+    return _emit
+
+
+def _log_status(message: str) -> None:
+    """Log ``message`` at INFO, skipping record creation when INFO is disabled."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(message.removesuffix("\r"))
+
+
+def _print_status(message: str) -> None:
+    r"""Print ``message``, leaving bare ``\r`` progress updates on the same line."""
+    print(  # noqa: T201
+        message,
+        end="" if "\r" in message and "\n" not in message else "\n",
+        flush=True,
+    )
 
 
 def format_action_label(*, dry_run: bool, cached: bool = False) -> str:
@@ -130,4 +169,5 @@ __all__ = [
     "format_time",
     "maybe_log_command",
     "parse_timespan_to_ms",
+    "status_emitter",
 ]
@@ -6,32 +6,42 @@ import bisect
 import json
 import logging
 import math
+import os
 import subprocess
-from typing import TYPE_CHECKING
+import threading
+from contextlib import suppress
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
 from ffclipper.models.context import RuntimeContext
-from ffclipper.models.ffprobe import AudioInfo, SubtitleTrack, VideoColorInfo, VideoInfo
+from ffclipper.models.ffprobe import AudioInfo, ProbeInfo, SubtitleTrack, VideoColorInfo, VideoInfo
 from ffclipper.models.types import ColorTransfer
 from ffclipper.models.verbosity import Verbosity
 
-from .cli import cache_key, get_ffprobe_version, join_command, run_ffprobe
+from .cli import FileStamp, cache_key, get_ffprobe_version, join_command, run_ffprobe
 from .helpers import emit_status, format_action_label
 
+try:  # Optional C parser; it raises a json.JSONDecodeError subclass, so callers need no changes.
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional speedup
+    _json_loads = json.loads
+
 if TYPE_CHECKING:
-    from collections.abc import Callable
-
-_QUIET = ["-v", "quiet"]
-_CSV_OUTPUT = ["-of", "csv=p=0"]
-_JSON_OUTPUT = ["-of", "json"]
-_SHOW_ENTRIES = ["-show_entries"]
-_SELECT_STREAMS = ["-select_streams"]
-_READ_INTERVALS = ["-read_intervals"]
-_SKIP_FRAME = ["-skip_frame"]
-_SKIP_NOKEY = [*_SKIP_FRAME, "nokey"]
-_SHOW_FRAMES = ["-show_frames"]
-_SHOW_PACKETS = ["-show_packets"]
-FFPROBE_SUBTITLE_STREAM = "s"
-FFPROBE_SUBTITLE_ENTRIES = "stream=index,codec_name:stream_tags=language,title"
+    from collections.abc import Callable, Mapping, Sequence
+    from concurrent.futures import ThreadPoolExecutor
+
+# Flag groups are tuples so commands are composed without mutable temporaries.
+_QUIET = ("-v", "quiet")
+_CSV_OUTPUT = ("-of", "csv=p=0")
+_JSON_OUTPUT = ("-of", "json")
+_SHOW_ENTRIES = ("-show_entries",)
+_SELECT_STREAMS = ("-select_streams",)
+_READ_INTERVALS = ("-read_intervals",)
+_SKIP_FRAME = ("-skip_frame",)
+_SKIP_NOKEY = (*_SKIP_FRAME, "nokey")
+_SHOW_FRAMES = ("-show_frames",)
+_SHOW_PACKETS = ("-show_packets",)
+_SHOW_STREAMS_FORMAT = ("-show_streams", "-show_format")
 FRAME_BEST_EFFORT = "frame=best_effort_timestamp_time"
 FRAME_PKT_PTS = "frame=pkt_pts_time"
 PACKET_PTS_FLAGS = "packet=pts_time,flags"
@@ -42,31 +52,76 @@ MAX_PAD_ATTEMPTS = 3
 END_BOUNDARY_FALLBACK_DELTA = 0.1
 MAX_DEBUG_KFS = 5
 
-EXPECTED_KF_PARTS = 2
-FLAGGED_APPROACH_INDEX = 2
+_KEY_FLAG_MARKER = ",K"
+FLAGGED_APPROACH_INDEX = 0
 
 
 _VERSION_KEY = "__ffprobe_version__"
+_TIMELINE_KEY = "__keyframe_timeline__"
 
 logger = logging.getLogger(__name__)
 
 _CACHE_FAILURE_ENTRY: tuple[bool, str | None] = (False, None)
-_CACHE_ENTRY_LENGTH = 2
+_CACHE_MISSING = object()
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    """Return environment variable ``name`` as an integer of at least 1, else ``default``."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        logger.warning("Ignoring %s=%r: expected a positive integer, using %d", name, raw, default)
+        return default
+    return value
+
+
+#: Concurrent ffprobe processes allowed when the context does not set ``max_probes``.
+DEFAULT_MAX_PROBES = _env_positive_int("FFCLIPPER_MAX_PROBES", os.cpu_count() or 4)
+CACHE_VERSION = 2  #: Bump to invalidate cached ffprobe results after format changes.
+FAILURE_TTL_S = 60.0  #: Seconds a failed ffprobe run stays cached, so transient errors retry.
+#: Most results one context keeps in memory; the least recently used are dropped first.
+MEMO_MAX_ENTRIES = _env_positive_int("FFCLIPPER_CACHE_MAX", 2048)
+_MEMO_LOCK = threading.Lock()
 
 
-def _decode_cache_entry(value: object) -> tuple[bool, str | None]:
-    """Normalize ffprobe cache entries."""
-    if isinstance(value, tuple) and len(value) == _CACHE_ENTRY_LENGTH and isinstance(value[0], bool):
-        ok, payload = value
-        if payload is None or isinstance(payload, str):
-            return ok, payload
-        return ok, str(payload)
-    if value is None or isinstance(value, str):
-        return True, value
-    return True, str(value)
+@cache
+def _probe_slots(limit: int) -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore bounding concurrent ffprobe runs to ``limit``."""
+    return threading.BoundedSemaphore(limit)
+
+
+@cache
+def _executor() -> ThreadPoolExecutor:
+    """Return the shared pool used by :func:`batch`, creating it on first use."""
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415 - only batched plans need a pool
+
+    # Probes mostly wait on subprocesses, so allow a few more threads than cores.
+    return ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4), thread_name_prefix="ffprobe")
+
+
+def batch[T](tasks: Mapping[str, Callable[[], T]]) -> dict[str, T]:
+    """Run independent blocking probes concurrently and return results by name.
+
+    The work is dominated by waiting on subprocesses, so threads suffice.
+    Results are collected in ``tasks`` order, so when several tasks fail the
+    earliest listed one raises, even if a later one failed first. Tasks that
+    have not started yet are cancelled.
+    """
+    futures = {name: _executor().submit(task) for name, task in tasks.items()}
+    try:
+        return {name: future.result() for name, future in futures.items()}
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        raise
 
 
-def _log_cmd(ctx: RuntimeContext, cmd: list[str], *, cached: bool = False) -> None:
+def _log_cmd(ctx: RuntimeContext, cmd: Sequence[str], *, cached: bool = False) -> None:
     """Log an ffprobe command banner with consistent labeling and routing."""
     action = format_action_label(dry_run=ctx.dry_run, cached=cached)
     emit_status(
@@ -95,24 +150,71 @@ def check_version(ctx: RuntimeContext) -> str:
     return version
 
 
-def run(ctx: RuntimeContext, cmd: list[str]) -> str | None:
-    """Run ``ffprobe`` with ``cmd`` and return stripped output or ``None``."""
-    key = cache_key(["ffprobe", *cmd])
-    if key in ctx.cache:
-        cached = ctx.cache[key]
+def _memo_get(ctx: RuntimeContext, key: tuple[object, ...]) -> object:
+    """Return the memoized result for ``key``, marking it most recently used."""
+    with _MEMO_LOCK:
+        value = ctx.probe_results.pop(key, _CACHE_MISSING)
+        if value is not _CACHE_MISSING:
+            ctx.probe_results[key] = value
+    return value
+
+
+def _memo_put(ctx: RuntimeContext, key: tuple[object, ...], value: object) -> None:
+    """Memoize ``value`` for ``key``, evicting the least recently used entry when full."""
+    with _MEMO_LOCK:
+        ctx.probe_results[key] = value
+        if len(ctx.probe_results) > MEMO_MAX_ENTRIES:
+            del ctx.probe_results[next(iter(ctx.probe_results))]
+
+
+def run(ctx: RuntimeContext, cmd: Sequence[str], *, stat_cache: dict[str, FileStamp] | None = None) -> str | None:
+    """Run ``ffprobe`` with ``cmd`` and return stripped output or ``None``.
+
+    At most ``ctx.max_probes`` (or :data:`DEFAULT_MAX_PROBES`) ffprobe
+    processes run at once across threads.
+
+    Results persist in ``ctx.cache`` across runs, keyed on the command, the
+    probed files' metadata, and :data:`CACHE_VERSION`. Failures expire after
+    :data:`FAILURE_TTL_S` seconds. Successful results are also kept in
+    ``ctx.probe_results`` under the same key, so repeated queries within one
+    context skip the on-disk lookup; at most :data:`MEMO_MAX_ENTRIES` are kept.
+
+    ``stat_cache`` is forwarded to :func:`cache_key` so callers running several
+    probes against the same file can stat it once.
+    """
+    key = (CACHE_VERSION, *cache_key(["ffprobe", *cmd], stat_cache=stat_cache))
+    memo = _memo_get(ctx, key)
+    cached = ctx.cache.get(key, _CACHE_MISSING) if memo is _CACHE_MISSING else (True, memo)
+    # Every entry under the current CACHE_VERSION is an ``(ok, payload)`` pair.
+    if isinstance(cached, tuple):
         if ctx.verbosity >= Verbosity.COMMANDS:
             _log_cmd(ctx, cmd, cached=True)
-        ok, payload = _decode_cache_entry(cached)
-        return payload if ok else None
+        ok, payload = cached
+        if not ok:
+            return None
+        _memo_put(ctx, key, payload)
+        return payload
+    ok, result = _run_uncached(ctx, cmd)
+    if not ok:
+        ctx.cache.set(key, _CACHE_FAILURE_ENTRY, expire=FAILURE_TTL_S)
+        return None
+    ctx.cache[key] = (True, result)
+    _memo_put(ctx, key, result)
+    return result
+
+
+def _run_uncached(ctx: RuntimeContext, cmd: Sequence[str]) -> tuple[bool, str | None]:
+    """Run ``ffprobe`` under the probe semaphore; return ``(ok, stripped output or None)``."""
     if ctx.verbosity >= Verbosity.COMMANDS:
         _log_cmd(ctx, cmd)
     try:
-        out = run_ffprobe(
-            cmd,
-            verbose=ctx.verbosity >= Verbosity.OUTPUT,
-            status_callback=ctx.status_callback,
-            list_cmd=False,
-        ).strip()
+        with _probe_slots(ctx.max_probes or DEFAULT_MAX_PROBES):
+            out = run_ffprobe(
+                cmd,
+                verbose=ctx.verbosity >= Verbosity.OUTPUT,
+                status_callback=ctx.status_callback,
+                list_cmd=False,
+            ).strip()
     except subprocess.CalledProcessError as exc:
         command = join_command("ffprobe", cmd)
         logger.warning("ffprobe command failed (%s): %s", exc.returncode, command, exc_info=exc)
@@ -121,11 +223,8 @@ def run(ctx: RuntimeContext, cmd: list[str]) -> str | None:
                 f"ffprobe failed ({exc.returncode}): {command}",
                 status_callback=ctx.status_callback,
             )
-        ctx.cache[key] = _CACHE_FAILURE_ENTRY
-        return None
-    result = out or None
-    ctx.cache[key] = (True, result)
-    return result
+        return False, None
+    return True, out or None
 
 
 def query[T](
@@ -137,7 +236,7 @@ def query[T](
     convert: Callable[[str], T] | None = None,
 ) -> T | str | None:
     """Execute a generic ``ffprobe`` query."""
-    cmd = _QUIET + ([*_SELECT_STREAMS, stream] if stream else []) + _SHOW_ENTRIES + [query] + _CSV_OUTPUT + [path]
+    cmd = (*_QUIET, *((*_SELECT_STREAMS, stream) if stream else ()), *_SHOW_ENTRIES, query, *_CSV_OUTPUT, path)
     out = run(ctx, cmd)
     if not out:
         return None
@@ -149,25 +248,22 @@ def query[T](
         return None
 
 
-def get_video_duration_sec(ctx: RuntimeContext, path: str) -> float | None:
-    """Get video duration in seconds."""
-    dur = query(ctx, path, "format=duration", convert=float)
-    return dur if isinstance(dur, (int, float)) else None
-
-
-def get_video_codec(ctx: RuntimeContext, path: str) -> VideoInfo | None:
-    """Get video codec information."""
-    codec = query(ctx, path, "stream=codec_name", "v:0")
-    return VideoInfo(codec=codec) if codec else None
+def _to_number[T](value: object, convert: Callable[[str], T]) -> T | None:
+    """Convert an ffprobe JSON field, treating missing or ``N/A`` values as ``None``."""
+    if value is None:
+        return None
+    try:
+        return convert(str(value))
+    except (ValueError, TypeError):
+        return None
 
 
-def get_video_color_info(ctx: RuntimeContext, path: str) -> VideoColorInfo | None:
-    """Get color metadata for the first video stream."""
-    primaries = query(ctx, path, "stream=color_primaries", "v:0")
-    transfer_raw = query(ctx, path, "stream=color_transfer", "v:0")
-    space = query(ctx, path, "stream=color_space", "v:0")
+def _color_info(stream: dict) -> VideoColorInfo | None:
+    """Build color metadata from an ffprobe video stream entry."""
+    primaries = stream.get("color_primaries")
+    space = stream.get("color_space")
     transfer: ColorTransfer | None = None
-    if transfer_raw:
+    if transfer_raw := stream.get("color_transfer"):
         try:
             transfer = ColorTransfer(transfer_raw)
         except ValueError:
@@ -177,92 +273,149 @@ def get_video_color_info(ctx: RuntimeContext, path: str) -> VideoColorInfo | Non
     return VideoColorInfo(primaries=primaries, transfer=transfer, space=space)
 
 
+def full_probe(ctx: RuntimeContext, path: str) -> dict[str, Any]:
+    """Return parsed ``-show_streams -show_format`` JSON for ``path``, or ``{}``.
+
+    Every metadata getter below slices this one cached ffprobe call, so
+    probing several fields of a file costs a single subprocess.
+    """
+    out = run(ctx, (*_QUIET, *_SHOW_STREAMS_FORMAT, *_JSON_OUTPUT, path))
+    if not out:
+        return {}
+    try:
+        data = _json_loads(out)
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _streams(data: dict[str, Any], codec_type: str) -> list[dict[str, Any]]:
+    """Return the streams of ``codec_type`` from :func:`full_probe` output, in file order."""
+    return [s for s in data.get("streams", []) if s.get("codec_type") == codec_type]
+
+
+def get_full_info(ctx: RuntimeContext, path: str) -> ProbeInfo | None:
+    """Return duration, codecs, audio bitrate, and color metadata from :func:`full_probe`.
+
+    Only the first video and first audio streams are considered, matching the
+    ``v:0``/``a:0`` selectors used elsewhere.
+    """
+    data = full_probe(ctx, path)
+    if not data:
+        return None
+    video = next(iter(_streams(data, "video")), None)
+    audio = next(iter(_streams(data, "audio")), None)
+    duration = _to_number(data.get("format", {}).get("duration"), float)
+    if duration is None and video is not None:
+        duration = _to_number(video.get("duration"), float)
+    return ProbeInfo(
+        duration_sec=duration,
+        video=VideoInfo(codec=video.get("codec_name")) if video is not None else None,
+        audio=(
+            AudioInfo(
+                codec=audio.get("codec_name"),
+                bitrate=_to_number(audio.get("bit_rate"), lambda s: int(int(s) / 1000)),
+            )
+            if audio is not None
+            else None
+        ),
+        color=_color_info(video) if video is not None else None,
+    )
+
+
+def get_video_duration_sec(ctx: RuntimeContext, path: str) -> float | None:
+    """Get video duration in seconds.
+
+    Uses the container-level duration and falls back to the first video
+    stream's duration when the container does not report one.
+    """
+    info = get_full_info(ctx, path)
+    return info.duration_sec if info is not None else None
+
+
+def get_video_codec(ctx: RuntimeContext, path: str) -> VideoInfo | None:
+    """Get video codec information."""
+    info = get_full_info(ctx, path)
+    if info is None or info.video is None or not info.video.codec:
+        return None
+    return VideoInfo(codec=info.video.codec)
+
+
+def get_video_color_info(ctx: RuntimeContext, path: str) -> VideoColorInfo | None:
+    """Get color metadata for the first video stream."""
+    info = get_full_info(ctx, path)
+    return info.color if info is not None else None
+
+
 def get_audio_bitrate(ctx: RuntimeContext, path: str) -> AudioInfo | None:
     """Get audio bitrate information."""
-    br = query(ctx, path, "stream=bit_rate", "a:0", convert=lambda s: int(int(s) / 1000))
-    return AudioInfo(bitrate=br) if isinstance(br, int) else None
+    info = get_full_info(ctx, path)
+    if info is None or info.audio is None or info.audio.bitrate is None:
+        return None
+    return AudioInfo(bitrate=info.audio.bitrate)
 
 
 def get_audio_codec(ctx: RuntimeContext, path: str) -> AudioInfo | None:
     """Get audio codec information."""
-    codec = query(ctx, path, "stream=codec_name", "a:0")
-    return AudioInfo(codec=codec) if codec else None
+    info = get_full_info(ctx, path)
+    if info is None or info.audio is None or not info.audio.codec:
+        return None
+    return AudioInfo(codec=info.audio.codec)
 
 
 def get_subtitle_tracks(ctx: RuntimeContext, video_path: str) -> list[SubtitleTrack]:
     """Get subtitle track information from a video file."""
-    cmd = (
-        _QUIET
-        + _SELECT_STREAMS
-        + [FFPROBE_SUBTITLE_STREAM]
-        + _SHOW_ENTRIES
-        + [FFPROBE_SUBTITLE_ENTRIES]
-        + _JSON_OUTPUT
-        + [video_path]
-    )
-    out = run(ctx, cmd)
-    if not out:
-        return []
-    try:
-        data = json.loads(out)
-
-        def build_track(i: int, stream: dict) -> SubtitleTrack:
-            tags = stream.get("tags", {})
-            language = tags.get("language", "und")
-            title = tags.get("title", "")
-            codec = stream.get("codec_name", "")
-            parts = [f"Track {i}: {language}"]
-            if title:
-                parts.append(f"- {title}")
-            if codec:
-                parts.append(f"({codec})")
-            return SubtitleTrack(
-                index=i,
-                display=" ".join(parts),
-                language=language,
-                title=title,
-                codec=codec,
-            )
 
-        streams = data.get("streams", [])
-        return [build_track(i, s) for i, s in enumerate(streams)]
-    except json.JSONDecodeError:
-        return []
+    def build_track(i: int, stream: dict) -> SubtitleTrack:
+        tags = stream.get("tags") or {}
+        language = tags.get("language", "und")
+        title = tags.get("title", "")
+        codec = stream.get("codec_name", "")
+        parts = [f"Track {i}: {language}"]
+        if title:
+            parts.append(f"- {title}")
+        if codec:
+            parts.append(f"({codec})")
+        return SubtitleTrack(
+            index=i,
+            display=" ".join(parts),
+            language=language,
+            title=title,
+            codec=codec,
+        )
+
+    # Filter and build in one pass; indices count subtitle streams only, as
+    # ``0:s:N`` selectors expect, so streams without a codec are kept.
+    streams = (s for s in full_probe(ctx, video_path).get("streams", ()) if s.get("codec_type") == "subtitle")
+    return [build_track(i, s) for i, s in enumerate(streams)]
 
 
 def list_kfs_in_window_sec_frames(
     ctx: RuntimeContext, path: str, start_s: float, end_s: float, pad_s: float = DEFAULT_PAD_S
 ) -> list[float]:
-    """Probe keyframes via frames (decode only the window)."""
+    """Probe keyframe times within a padded window around ``[start_s, end_s]``."""
+    # All approaches probe the same file; stat it once for their cache keys.
+    stat_cache: dict[str, FileStamp] = {}
     a = max(0.0, start_s - pad_s)
     dur = (end_s - start_s) + PAD_EDGE_MULTIPLIER * pad_s
 
-    base = [
-        *_QUIET,
-        *_SELECT_STREAMS,
-        "v:0",
-        *_READ_INTERVALS,
-        f"{a}%+{dur}",
-        *_SKIP_NOKEY,
-    ]
+    base = (*_QUIET, *_SELECT_STREAMS, "v:0", *_READ_INTERVALS, f"{a}%+{dur}")
+    # Packet flags need no decoding, so try them first; the frame approaches
+    # decode keyframes only and serve as fallbacks for containers without flags.
     entries = [
-        (_SHOW_FRAMES, FRAME_BEST_EFFORT),
-        (_SHOW_FRAMES, FRAME_PKT_PTS),
         (_SHOW_PACKETS, PACKET_PTS_FLAGS),
+        (_SKIP_NOKEY + _SHOW_FRAMES, FRAME_BEST_EFFORT),
+        (_SKIP_NOKEY + _SHOW_FRAMES, FRAME_PKT_PTS),
     ]
-    approaches = [base + show + ["-show_entries", ent, *_CSV_OUTPUT, path] for show, ent in entries]
+    approaches = [(*base, *show, *_SHOW_ENTRIES, ent, *_CSV_OUTPUT, path) for show, ent in entries]
     for i, cmd in enumerate(approaches):
-        out = run(ctx, cmd)
+        out = run(ctx, cmd, stat_cache=stat_cache)
         if not out:
             continue
-        kfs: list[float] = []
-        for raw_line in out.splitlines():
-            line = raw_line.strip()
-            if not line:
-                continue
-            t = _parse_kf_line(line, require_flag=i == FLAGGED_APPROACH_INDEX)
-            if t is not None:
-                kfs.append(t)
+        if i == FLAGGED_APPROACH_INDEX:
+            kfs = _flagged_keyframe_times(out)
+        else:
+            kfs = [t for line in out.splitlines() if (t := _parse_kf_line(line)) is not None]
         if kfs:
             if ctx.verbosity >= Verbosity.COMMANDS:
                 msg = (
@@ -272,54 +425,158 @@ def list_kfs_in_window_sec_frames(
                     f"{'...' if len(kfs) > MAX_DEBUG_KFS else ''}"
                 )
                 emit_status(msg, status_callback=ctx.status_callback)
-            return sorted(kfs)
+            kfs.sort()
+            return kfs
     if ctx.verbosity >= Verbosity.COMMANDS:
         msg = f"No keyframes found in window [{a:.1f}s, {a + dur:.1f}s] with any approach"
         emit_status(msg, status_callback=ctx.status_callback)
     return []
 
 
+def get_keyframe_timeline(ctx: RuntimeContext, path: str) -> tuple[float, ...]:
+    """Return sorted keyframe times for the whole first video stream.
+
+    Reads packet flags only, so nothing is decoded. The listing can run to
+    megabytes on long sources, so only the parsed timeline is cached, keyed on
+    the file's metadata like any other probe. Returns an empty tuple when the
+    container does not flag keyframes.
+    """
+    cmd = (*_QUIET, *_SELECT_STREAMS, "v:0", *_SHOW_PACKETS, *_SHOW_ENTRIES, PACKET_PTS_FLAGS, *_CSV_OUTPUT, path)
+    key = (CACHE_VERSION, _TIMELINE_KEY, *cache_key(["ffprobe", *cmd]))
+    memo = _memo_get(ctx, key)
+    cached = ctx.cache.get(key, _CACHE_MISSING) if memo is _CACHE_MISSING else memo
+    if isinstance(cached, tuple):
+        if ctx.verbosity >= Verbosity.COMMANDS:
+            _log_cmd(ctx, cmd, cached=True)
+        _memo_put(ctx, key, cached)
+        return cached
+    ok, out = _run_uncached(ctx, cmd)
+    kfs = _flagged_keyframe_times(out) if out else []
+    kfs.sort()
+    timeline = tuple(kfs)
+    if ok:
+        ctx.cache[key] = timeline
+    else:
+        ctx.cache.set(key, timeline, expire=FAILURE_TTL_S)
+    _memo_put(ctx, key, timeline)
+    return timeline
+
+
+def _bounded_packet_keyframes(
+    ctx: RuntimeContext, path: str, start_s: float, end_s: float, pad_s: float = DEFAULT_PAD_S
+) -> list[float]:
+    """List flagged keyframes from ``pad_s`` before ``start_s`` up to a hard stop ``pad_s`` after ``end_s``."""
+    a = max(0.0, start_s - pad_s)
+    b = end_s + pad_s
+    cmd = (
+        *_QUIET,
+        *_SELECT_STREAMS,
+        "v:0",
+        *_READ_INTERVALS,
+        f"{a}%{b}",
+        *_SHOW_PACKETS,
+        *_SHOW_ENTRIES,
+        PACKET_PTS_FLAGS,
+        *_CSV_OUTPUT,
+        path,
+    )
+    if not (out := run(ctx, cmd)):
+        return []
+    kfs = _flagged_keyframe_times(out)
+    kfs.sort()
+    return kfs
+
+
+def _snap_to_keyframes(kfs: Sequence[float], start_s: float, end_s: float) -> tuple[float, float]:
+    """Widen ``[start_s, end_s]`` outward to the surrounding keyframes in sorted ``kfs``."""
+    i = bisect.bisect_right(kfs, start_s) - 1
+    i = max(i, 0)
+    start_kf = kfs[i]
+
+    j = bisect.bisect_right(kfs, end_s)
+    if j > 0 and math.isclose(kfs[j - 1], end_s, abs_tol=1e-6):
+        j -= 1
+    if j >= len(kfs):
+        j = len(kfs) - 1
+    end_boundary = kfs[j]
+    if end_boundary <= start_kf:
+        end_boundary = start_kf + END_BOUNDARY_FALLBACK_DELTA
+    return start_kf, end_boundary
+
+
 def snap_window_copy_bounds(ctx: RuntimeContext, path: str, start_s: float, end_s: float) -> tuple[float, float]:
-    """Snap start/end to keyframes within a window to avoid mid-GOP cuts."""
+    """Snap start/end to keyframes within a window to avoid mid-GOP cuts.
+
+    Lists packet flags only, in a window padded around ``[start_s, end_s]``
+    with a hard stop past ``end_s``, growing the pad until the listing brackets
+    the window; a window that reaches past the end of the file brackets it by
+    definition. Only when that fails does it list the whole file's keyframes,
+    and only when the container has no keyframe flags does it fall back to
+    decoding growing windows.
+    """
+    duration: float | None = None
     pad = DEFAULT_PAD_S
     for _ in range(MAX_PAD_ATTEMPTS):
-        kfs = list_kfs_in_window_sec_frames(ctx, path, start_s, end_s, pad_s=pad)
-        if kfs:
-            i = bisect.bisect_right(kfs, start_s) - 1
-            i = max(i, 0)
-            start_kf = kfs[i]
-
-            j = bisect.bisect_right(kfs, end_s)
-            if j > 0 and math.isclose(kfs[j - 1], end_s, abs_tol=1e-6):
-                j -= 1
-            if j >= len(kfs):
-                j = len(kfs) - 1
-            end_boundary = kfs[j]
-            if end_boundary <= start_kf:
-                end_boundary = start_kf + END_BOUNDARY_FALLBACK_DELTA
-            return start_kf, end_boundary
+        bounded = _bounded_packet_keyframes(ctx, path, start_s, end_s, pad)
+        if bounded and bounded[0] <= start_s:
+            if bounded[-1] >= end_s or math.isclose(bounded[-1], end_s, abs_tol=1e-6):
+                return _snap_to_keyframes(bounded, start_s, end_s)
+            if duration is None:
+                duration = get_video_duration_sec(ctx, path) or math.inf
+            if end_s + pad >= duration:
+                return _snap_to_keyframes(bounded, start_s, end_s)
+        pad *= PAD_GROWTH_FACTOR
+    if kfs := get_keyframe_timeline(ctx, path):
+        return _snap_to_keyframes(kfs, start_s, end_s)
+    pad = DEFAULT_PAD_S
+    for _ in range(MAX_PAD_ATTEMPTS):
+        if window_kfs := list_kfs_in_window_sec_frames(ctx, path, start_s, end_s, pad_s=pad):
+            return _snap_to_keyframes(window_kfs, start_s, end_s)
         pad *= PAD_GROWTH_FACTOR
     return start_s, end_s
 
 
-def _parse_kf_line(line: str, *, require_flag: bool) -> float | None:
-    parts = line.split(",", 1)
-    if require_flag and (len(parts) != EXPECTED_KF_PARTS or "K" not in parts[1]):
-        return None
+def _flagged_keyframe_times(out: str) -> list[float]:
+    """Extract ``pts_time`` values of keyframe rows from ``pts_time,flags`` CSV output.
+
+    The list is fresh, so callers sort it in place rather than copying it with
+    ``sorted``. Rows arrive in decode order, which is nearly always presentation
+    order, and Timsort finishes such input in a single linear pass.
+
+    Packet listings can run to many thousands of rows, nearly all non-key, so
+    this jumps between ``",K"`` markers (keyframe flags start with ``K``) with
+    ``str.find`` instead of parsing every line.
+    """
+    kfs: list[float] = []
+    i = out.find(_KEY_FLAG_MARKER)
+    while i != -1:
+        line_start = out.rfind("\n", 0, i) + 1
+        with suppress(ValueError):
+            kfs.append(float(out[line_start:i]))
+        i = out.find(_KEY_FLAG_MARKER, i + len(_KEY_FLAG_MARKER))
+    return kfs
+
+
+def _parse_kf_line(line: str) -> float | None:
     try:
-        return float(parts[0])
+        return float(line.split(",", 1)[0])
     except ValueError:
         return None
 
 
 __all__ = [
     "RuntimeContext",
+    "batch",
     "check_version",
     "clear_cache",
+    "full_probe",
     "get_audio_bitrate",
     "get_audio_codec",
+    "get_full_info",
+    "get_keyframe_timeline",
     "get_subtitle_tracks",
     "get_video_codec",
+    "get_video_color_info",
     "get_video_duration_sec",
     "list_kfs_in_window_sec_frames",
     "query",
@@ -9,14 +9,63 @@ from __future__ import annotations
 import os
 import shutil
 import subprocess
-from typing import TYPE_CHECKING
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 import pytest
 
+from ffclipper.models import ColorTransfer, ProbeInfo, RuntimeContext, VideoColorInfo
+from ffclipper.tools import probe
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterator
+
+    from diskcache import Cache
+
 # Duration in seconds used by synthetic sample videos in tests.
 VIDEO_DURATION_SEC: float = 4.0
 
 
+#: Memory-backed directory used for temporary test files when available.
+_SHM_DIR = Path("/dev/shm")  # noqa: S108
+_SHM_BASETEMP = pytest.StashKey[Path]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Keep temporary test files on tmpfs on Linux unless ``--basetemp`` is given.
+
+    xdist workers inherit the controller's base temp, so only the controller
+    picks a directory; it is removed again in :func:`pytest_unconfigure`.
+    """
+    if config.option.basetemp or hasattr(config, "workerinput"):
+        return
+    if sys.platform == "linux" and _SHM_DIR.is_dir() and os.access(_SHM_DIR, os.W_OK):
+        config.option.basetemp = tempfile.mkdtemp(prefix="ffclipper-pytest-", dir=_SHM_DIR)
+        config.stash[_SHM_BASETEMP] = Path(config.option.basetemp)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Free the tmpfs base temp created by :func:`pytest_configure`."""
+    if (basetemp := config.stash.get(_SHM_BASETEMP, None)) is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_probe_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Give each test session (and so each xdist worker) its own probe cache.
+
+    ``probe.clear_cache()`` then only affects the calling worker instead of a
+    cache directory shared through the system temp dir.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("ffclipper.models.context._CACHE_DIR", tmp_path_factory.mktemp("ffclipper-cache"))
+        yield
+
+
 @pytest.fixture(autouse=True)
 def _no_open_dir(monkeypatch: pytest.MonkeyPatch) -> None:
     """Disable opening directories during tests.
@@ -43,67 +92,237 @@ def _tools_version_sanity(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("ffclipper.tools.probe.check_version", lambda *args, **kwargs: None, raising=True)
 
 
-if TYPE_CHECKING:  # pragma: no cover - typing only
-    from pathlib import Path
+@pytest.fixture
+def no_ffmpeg(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Turn ffmpeg execution into a no-op for tests that only inspect commands."""
+    monkeypatch.setattr("ffclipper.backend.executor.run_ffmpeg", lambda *_args, **_kwargs: "")
+
+
+class _DictCache(dict["Hashable", object]):
+    """In-memory stand-in for the parts of ``diskcache.Cache`` that probing uses."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._deadlines: dict[Hashable, float] = {}
+
+    def __setitem__(self, key: Hashable, value: object) -> None:
+        self._deadlines.pop(key, None)
+        super().__setitem__(key, value)
+
+    def get(self, key: Hashable, default: object = None) -> object:  # type: ignore[override]
+        deadline = self._deadlines.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            del self._deadlines[key]
+            self.pop(key, None)
+        return super().get(key, default)
+
+    def set(self, key: Hashable, value: object, expire: float | None = None) -> bool:
+        self[key] = value
+        if expire is not None:
+            self._deadlines[key] = time.monotonic() + expire
+        return True
+
+    def close(self) -> None:
+        """Match ``Cache.close``; there is nothing to release."""
 
 
 @pytest.fixture
-def source_file(tmp_path: Path) -> Path:
-    """Provide a small synthetic MP4 video for tests.
+def memory_cache() -> Cache:
+    """Provide a dict-backed probe cache so tests skip diskcache's SQLite file."""
+    return cast("Cache", _DictCache())
 
-    Creates a 4-second 200x200 color clip using ffmpeg.
-    Some encoders fail to encode much lower than 200x200.
-    """
+
+@pytest.fixture
+def hdr_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Report probed sources as HDR (PQ transfer) while keeping real stream metadata."""
+    real = probe.get_full_info
+
+    def fake(ctx: RuntimeContext, path: str) -> ProbeInfo | None:
+        info = real(ctx, path)
+        return replace(info or ProbeInfo(), color=VideoColorInfo(transfer=ColorTransfer.PQ))
+
+    monkeypatch.setattr(probe, "get_full_info", fake)
+
+
+@pytest.fixture(scope="session")
+def ffmpeg_bin() -> str:
+    """Return the ``ffmpeg`` executable, looked up on ``PATH`` once per session."""
     ffmpeg = shutil.which("ffmpeg")
     assert ffmpeg, "ffmpeg must be available in PATH for tests"
+    return ffmpeg
+
+
+_SUBTITLE_CUE = b"1\n00:00:01,000 --> 00:00:02,000\nhello\n"
+
+
+def _source_clip_cmd(ffmpeg: str, out: Path) -> list[str]:
+    """Return the ffmpeg argv for the synthetic MP4 used by ``source_file``.
+
+    Creates a 4-second 200x200 color clip.
+    Some encoders fail to encode much lower than 200x200.
+    """
+    return [
+        ffmpeg,
+        "-v",
+        "error",
+        # Video source
+        "-f",
+        "lavfi",
+        "-i",
+        f"color=s=200x200:d={VIDEO_DURATION_SEC}",
+        # Audio source (silent stereo)
+        "-f",
+        "lavfi",
+        "-i",
+        f"anullsrc=r=48000:cl=stereo:d={VIDEO_DURATION_SEC}",
+        # Shortest to match streams
+        "-shortest",
+        # Encode video and audio; the fastest x264 preset is plenty for a flat test clip
+        "-c:v",
+        "libx264",
+        "-preset",
+        "ultrafast",
+        "-tune",
+        "zerolatency",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "128k",
+        "-y",
+        str(out),
+    ]
+
+
+def _subs_clip_cmd(ffmpeg: str, out: Path) -> list[str]:
+    """Return the ffmpeg argv for the synthetic MKV used by ``sample_video_with_subs``."""
+    return [
+        ffmpeg,
+        "-v",
+        "error",
+        "-f",
+        "lavfi",
+        "-i",
+        f"color=s=200x200:d={VIDEO_DURATION_SEC}",
+        # The one-cue SRT arrives on stdin, so no subtitle file is written
+        "-f",
+        "srt",
+        "-i",
+        "pipe:0",
+        # Lossless intra-only video: nothing decodes it for content, and
+        # FFV1 skips x264's rate control while staying a few KB per copy.
+        "-c:v",
+        "ffv1",
+        "-level",
+        "0",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:s",
+        "srt",
+        "-map",
+        "0",
+        "-map",
+        "1",
+        "-y",
+        str(out),
+    ]
+
+
+def _wait_for_sample(proc: subprocess.Popen[bytes], out: Path) -> Path:
+    """Block until ``proc`` has written ``out``, raising if ffmpeg failed."""
+    if proc.wait():
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    return out
+
+
+@pytest.fixture(scope="session")
+def _sample_encodes(
+    tmp_path_factory: pytest.TempPathFactory, ffmpeg_bin: str
+) -> Iterator[dict[str, tuple[subprocess.Popen[bytes], Path]]]:
+    """Start every session sample encode at once the first time any sample is needed.
+
+    Each encode is its own ffmpeg process, so launching them together lets the
+    clips build in roughly the time of the slowest one rather than their sum.
+    """
+    data_dir = tmp_path_factory.mktemp("data")
+    source = data_dir / "video.mp4"
+    subs = data_dir / "video.mkv"
+    # Nothing reads ffmpeg's stdout; ``-v error`` leaves stderr for failures only.
+    source_proc = subprocess.Popen(  # noqa: S603
+        _source_clip_cmd(ffmpeg_bin, source), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL
+    )
+    subs_proc = subprocess.Popen(  # noqa: S603
+        _subs_clip_cmd(ffmpeg_bin, subs), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL
+    )
+    encodes = {"source": (source_proc, source), "subs": (subs_proc, subs)}
+    if subs_proc.stdin is not None:
+        subs_proc.stdin.write(_SUBTITLE_CUE)
+        subs_proc.stdin.close()
+    yield encodes
+    for proc, _ in encodes.values():
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+@pytest.fixture(scope="session")
+def _encoded_source_file(_sample_encodes: dict[str, tuple[subprocess.Popen[bytes], Path]]) -> Path:
+    """Wait for the session's synthetic MP4 encode used by ``source_file``."""
+    return _wait_for_sample(*_sample_encodes["source"])
+
+
+@pytest.fixture
+def source_file(_encoded_source_file: Path, tmp_path: Path) -> Path:
+    """Provide a small synthetic MP4 video for tests.
+
+    Each test gets its own copy, so outputs written next to the source and
+    in-place changes stay isolated without re-encoding.
+    """
     data_dir = tmp_path / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
-    out = data_dir / "video.mp4"
-    subprocess.run(  # noqa: S603
-        [
-            ffmpeg,
-            "-v",
-            "error",
-            # Video source
-            "-f",
-            "lavfi",
-            "-i",
-            f"color=s=200x200:d={VIDEO_DURATION_SEC}",
-            # Audio source (silent stereo)
-            "-f",
-            "lavfi",
-            "-i",
-            f"anullsrc=r=48000:cl=stereo:d={VIDEO_DURATION_SEC}",
-            # Shortest to match streams
-            "-shortest",
-            # Encode video and audio
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "128k",
-            "-y",
-            str(out),
-        ],
-        check=True,
-    )
-    return out
+    return Path(shutil.copy(_encoded_source_file, data_dir / _encoded_source_file.name))
+
+
+@pytest.fixture(scope="session")
+def shared_source_file(_encoded_source_file: Path) -> Path:
+    """Provide the session's synthetic MP4 itself, for tests that only read it.
+
+    Repeated probes of the same unchanged path hit the session probe cache.
+    """
+    return _encoded_source_file
+
+
+@pytest.fixture(scope="session")
+def runtime_ctx() -> Iterator[RuntimeContext]:
+    """Share one runtime context, and its open cache, across tests that only plan.
+
+    Tests that depend on per-context state such as the version-check flag or
+    the probe memo should build their own context instead.
+    """
+    with RuntimeContext() as ctx:
+        yield ctx
+
+
+@pytest.fixture(scope="session")
+def sample_video_with_subs(_sample_encodes: dict[str, tuple[subprocess.Popen[bytes], Path]]) -> Path:
+    """Provide a 4-second MKV with one SRT subtitle track, built once per session.
+
+    Consumers treat the clip as read-only input and write their outputs to
+    their own ``tmp_path``, so every test shares the same file.
+    """
+    return _wait_for_sample(*_sample_encodes["subs"])
 
 
 @pytest.fixture
-def odd_width_source_file(tmp_path: Path) -> Path:
+def odd_width_source_file(tmp_path: Path, ffmpeg_bin: str) -> Path:
     """Provide a VP8 WebM source with an odd frame width."""
-    ffmpeg = shutil.which("ffmpeg")
-    assert ffmpeg, "ffmpeg must be available in PATH for tests"
     data_dir = tmp_path / "odd"
     data_dir.mkdir(parents=True, exist_ok=True)
     out = data_dir / "odd.webm"
     subprocess.run(  # noqa: S603
         [
-            ffmpeg,
+            ffmpeg_bin,
             "-v",
             "error",
             "-f",
@@ -121,6 +340,8 @@ def odd_width_source_file(tmp_path: Path) -> Path:
             "-y",
             str(out),
         ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
         check=True,
     )
     return out
@@ -11,30 +11,27 @@ from ffclipper.models.options import (
 )
 
 
-def test_defaults_none_with_copy(source_file: Path) -> None:
+def test_defaults_none_with_copy(shared_source_file: Path, runtime_ctx: RuntimeContext) -> None:
     """Leave audio bitrate unset when stream copying."""
-    opts = Options(source=source_file, audio=AudioOptions(copy=True, downmix_to_stereo=False))
+    opts = Options(source=shared_source_file, audio=AudioOptions(copy=True, downmix_to_stereo=False))
     assert opts.audio.kbps is None
-    with RuntimeContext() as ctx:
-        plan = ClipPlan.from_options(opts, ctx)
+    plan = ClipPlan.from_options(opts, runtime_ctx)
     assert plan.opts.audio.kbps is None
 
 
-def test_defaults_resolved_when_encoding(source_file: Path) -> None:
+def test_defaults_resolved_when_encoding(shared_source_file: Path, runtime_ctx: RuntimeContext) -> None:
     """Resolve audio bitrate default when encoding."""
-    opts = Options(source=source_file)
+    opts = Options(source=shared_source_file)
     assert opts.audio.kbps == DEFAULT_AUDIO_KBPS
-    with RuntimeContext() as ctx:
-        plan = ClipPlan.from_options(opts, ctx)
+    plan = ClipPlan.from_options(opts, runtime_ctx)
     assert plan.opts.audio.kbps == DEFAULT_AUDIO_KBPS
 
 
-def test_defaults_none_without_audio(source_file: Path) -> None:
+def test_defaults_none_without_audio(shared_source_file: Path, runtime_ctx: RuntimeContext) -> None:
     """Clear audio bitrate when excluding audio."""
-    opts = Options(source=source_file, audio=AudioOptions(include=False, downmix_to_stereo=False))
+    opts = Options(source=shared_source_file, audio=AudioOptions(include=False, downmix_to_stereo=False))
     assert opts.audio.kbps is None
-    with RuntimeContext() as ctx:
-        plan = ClipPlan.from_options(opts, ctx)
+    plan = ClipPlan.from_options(opts, runtime_ctx)
     assert plan.opts.audio.kbps is None
 
 
@@ -11,8 +11,7 @@ from ffclipper.backend.builder.command_builder import (
     _trim_args,
     build_command,
 )
-from ffclipper.models import ClipPlan, ColorTransfer, Options, RuntimeContext
-from ffclipper.models.ffprobe import VideoColorInfo
+from ffclipper.models import ClipPlan, Options, RuntimeContext
 from ffclipper.models.options import AudioOptions, TimeOptions, VideoOptions
 from ffclipper.models.plan import CLIP_SUFFIX
 from ffclipper.tools import probe as probe_module
@@ -93,14 +92,9 @@ def test_keyframe_trim_when_fast_copy_disabled(monkeypatch: pytest.MonkeyPatch,
 
 
 def test_command_builder_inits_vulkan_for_libplacebo_tonemap(
-    monkeypatch: pytest.MonkeyPatch, source_file: Path
+    monkeypatch: pytest.MonkeyPatch, source_file: Path, hdr_probe: None
 ) -> None:
     """Initialize Vulkan when tonemapping with libplacebo."""
-    monkeypatch.setattr(
-        probe_module,
-        "get_video_color_info",
-        lambda ctx, path: VideoColorInfo(transfer=ColorTransfer.PQ),
-    )
     monkeypatch.setattr(video, "has_libplacebo", lambda _ctx: True)
     opts = Options(source=source_file)
     plan = ClipPlan.from_options(opts, RuntimeContext())
@@ -1,4 +1,5 @@
 import subprocess
+import time
 from pathlib import Path
 
 import pytest
@@ -11,30 +12,59 @@ from ffclipper.models.types import Encoder, VideoCodec
 from ffclipper.tools import capabilities
 
 
-def test_available_encoders(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    """Discover encoders by attempting a tiny encode."""
+def test_available_encoders(monkeypatch: pytest.MonkeyPatch, memory_cache: Cache) -> None:
+    """List built-in encoders once and trial-encode only hardware ones."""
+    listing = (
+        "Encoders:\n V..... = Video\n ------\n"
+        " V....D libx264              libx264 H.264\n"
+        " V....D h264_nvenc           NVIDIA NVENC H.264 encoder\n"
+        " V....D hevc_nvenc           NVIDIA NVENC hevc encoder\n"
+    )
     attempted: list[str] = []
 
     def fake_run(args: list[str], **_: dict) -> str:
+        if "-encoders" in args:
+            attempted.append("-encoders")
+            return listing
         enc = args[args.index("-c:v") + 1]
         attempted.append(enc)
-        if enc == Encoder.X264.ffmpeg_name:
+        if enc == Encoder.HEVC_NVENC.ffmpeg_name:
             return ""
         raise subprocess.CalledProcessError(1, args)
 
     monkeypatch.setattr(capabilities, "run_ffmpeg", fake_run)
-    ctx = RuntimeContext(cache=Cache(str(tmp_path)))
+    ctx = RuntimeContext(cache=memory_cache)
     res = capabilities.available_encoders(ctx)
-    expected_args = [e.ffmpeg_name for e in Encoder if e is not Encoder.AUTO]
-    assert attempted == expected_args
-    assert res == {Encoder.X264}
+    # Probes run concurrently, so only the set of attempts is deterministic.
+    expected_attempts = ["-encoders", "h264_nvenc", "hevc_nvenc"]
+    assert sorted(attempted) == expected_attempts
+    assert res == {Encoder.X264, Encoder.HEVC_NVENC}
     # Cached result
     res2 = capabilities.available_encoders(ctx)
-    assert res2 == {Encoder.X264}
-    assert attempted == expected_args
+    assert res2 == {Encoder.X264, Encoder.HEVC_NVENC}
+    assert sorted(attempted) == expected_attempts
 
 
-def test_has_libplacebo(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_available_encoders_without_listing(monkeypatch: pytest.MonkeyPatch, memory_cache: Cache) -> None:
+    """Trial-encode every candidate when ``ffmpeg -encoders`` fails."""
+    attempted: list[str] = []
+
+    def fake_run(args: list[str], **_: dict) -> str:
+        if "-encoders" in args:
+            raise subprocess.CalledProcessError(1, args)
+        enc = args[args.index("-c:v") + 1]
+        attempted.append(enc)
+        if enc == Encoder.X264.ffmpeg_name:
+            return ""
+        raise subprocess.CalledProcessError(1, args)
+
+    monkeypatch.setattr(capabilities, "run_ffmpeg", fake_run)
+    ctx = RuntimeContext(cache=memory_cache)
+    assert capabilities.available_encoders(ctx) == {Encoder.X264}
+    assert sorted(attempted) == sorted(e.ffmpeg_name for e in Encoder if e is not Encoder.AUTO)
+
+
+def test_has_libplacebo(monkeypatch: pytest.MonkeyPatch, memory_cache: Cache) -> None:
     """Detect libplacebo filter by attempting a tiny filter graph."""
     calls: list[list[str]] = []
 
@@ -43,7 +73,7 @@ def test_has_libplacebo(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None
         return ""
 
     monkeypatch.setattr(capabilities, "run_ffmpeg", fake_run)
-    ctx = RuntimeContext(cache=Cache(str(tmp_path)))
+    ctx = RuntimeContext(cache=memory_cache)
     assert capabilities.has_libplacebo(ctx) is True
     expected = [
         "-init_hw_device",
@@ -80,6 +110,28 @@ def test_plan_requires_available_encoder(monkeypatch: pytest.MonkeyPatch, tmp_pa
         )
 
 
+def test_plan_reports_encoder_error_before_probe_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """A missing encoder wins over a source probe that failed sooner."""
+    src = tmp_path / "a.mp4"
+    src.touch()
+
+    def slow_encoders(_ctx: RuntimeContext) -> set[Encoder]:
+        time.sleep(0.05)
+        return {Encoder.X264}
+
+    def failing_probe(_ctx: RuntimeContext, source: str) -> None:
+        raise subprocess.CalledProcessError(1, ["ffprobe", source])
+
+    monkeypatch.setattr(plan_module, "_ensure_tools", lambda _ctx: None)
+    monkeypatch.setattr(plan_module, "available_encoders", slow_encoders)
+    monkeypatch.setattr(plan_module.probe, "get_full_info", failing_probe)
+    with pytest.raises(ValueError, match="not available"):
+        ClipPlan.from_options(
+            Options(source=src, video=VideoOptions(encoder=Encoder.HEVC_NVENC)),
+            RuntimeContext(),
+        )
+
+
 def test_plan_auto_selects_best_encoder(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
     """Automatically choose best encoder for requested codec."""
     monkeypatch.setattr(plan_module, "available_encoders", lambda _ctx: {Encoder.H264_NVENC})
@@ -109,3 +161,27 @@ def test_plan_auto_selects_best_encoder(monkeypatch: pytest.MonkeyPatch, source_
             Options(source=source_file, video=VideoOptions(codec=VideoCodec.H264)),
             RuntimeContext(),
         )
+
+
+def test_capability_cache_tracks_ffmpeg_binary(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, memory_cache: Cache
+) -> None:
+    """Re-probe capabilities when the ffmpeg executable changes."""
+    exe = tmp_path / "ffmpeg"
+    exe.write_text("v1")
+    calls: list[list[str]] = []
+
+    def fake_run(args: list[str], **_: dict) -> str:
+        calls.append(args)
+        return ""
+
+    monkeypatch.setattr(capabilities, "_ffmpeg_executable", lambda: str(exe))
+    monkeypatch.setattr(capabilities, "run_ffmpeg", fake_run)
+    ctx = RuntimeContext(cache=memory_cache)
+    assert capabilities.has_libplacebo(ctx) is True
+    assert capabilities.has_libplacebo(ctx) is True
+    assert len(calls) == 1
+
+    exe.write_text("v2 upgraded")
+    assert capabilities.has_libplacebo(ctx) is True
+    assert len(calls) == 2
@@ -36,7 +36,8 @@ def test_cli_conversion(tmp_path: Path, source_file: Path) -> None:
     assert code == 0
     output = local_src.with_name(f"{local_src.stem}_clip.{DEFAULT_CONTAINER.value}")
     assert output.is_file()
-    duration = probe.get_video_duration_sec(probe.RuntimeContext(), str(output))
+    with probe.RuntimeContext() as ctx:
+        duration = probe.get_video_duration_sec(ctx, str(output))
     assert duration is not None
     assert 0.9 <= duration <= 1.1
 
@@ -2,6 +2,7 @@
 
 import shutil
 import subprocess
+import sys
 
 
 def test_help_hides_internal_options() -> None:
@@ -16,3 +17,16 @@ def test_help_hides_internal_options() -> None:
         check=True,
     )
     assert "status-callback" not in result.stdout
+
+
+def test_help_skips_cache_backend() -> None:
+    """Rendering help does not import diskcache, which only probing needs."""
+    code = "import sys; from ffclipper.cli import main; main(['--help']); print('diskcache' in sys.modules)"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        check=False,
+    )
+    assert result.stdout.rstrip().endswith("False")
@@ -1,8 +1,6 @@
 """Tests for FFmpeg execution helpers."""
 
 import os
-import shutil
-import subprocess
 import uuid
 from collections.abc import Callable
 from pathlib import Path
@@ -51,15 +49,11 @@ def test_run_conversion_dry_run(source_file: Path, monkeypatch: pytest.MonkeyPat
     assert result.output == expected_output
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_two_pass_stats_cleanup(source_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Remove encoder pass stats files after conversion."""
     monkeypatch.chdir(tmp_path)
     monkeypatch.setattr(executor.uuid, "uuid4", lambda: uuid.UUID(int=0))
-
-    def fake_run_ffmpeg(*_args, **_kwargs) -> None:
-        return None
-
-    monkeypatch.setattr(executor, "run_ffmpeg", fake_run_ffmpeg)
     stats_base = "00000000000000000000000000000000"
     (tmp_path / f"{stats_base}.x264-0.log").write_text("stats")
     (tmp_path / f"{stats_base}.x264-0.log.mbtree").write_text("stats")
@@ -102,19 +96,20 @@ def test_run_conversion_verbosity_levels(
     assert all(c == expected for c in calls)
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_run_conversion_full(source_file: Path) -> None:
-    """Run ffmpeg and produce a trimmed output clip."""
+    """Trim the encoded clip to the requested start and duration."""
     opts = Options(source=source_file, time=TimeOptions(start="00:00:01", end="00:00:03"))
     commands, result = executor.run_conversion(opts)
     assert result.success
     assert result.output is not None
-    out_path = Path(result.output)
-    assert out_path.is_file()
-    duration = probe.get_video_duration_sec(RuntimeContext(), result.output)
-    assert duration is not None
-    assert 1.9 <= duration <= 2.1
+    # The trimmed duration itself is checked end to end in test_ffclipper_end_to_end.
+    final_cmd = commands[-1]
+    assert final_cmd[final_cmd.index("-ss") + 1] == "00:00:01.000"
+    assert final_cmd[final_cmd.index("-t") + 1] == "00:00:02.000"
 
 
+@pytest.mark.slow
 def test_run_conversion_pads_odd_dimensions(odd_width_source_file: Path, tmp_path: Path) -> None:
     """Pad odd source dimensions so encoding succeeds."""
     output = tmp_path / "odd_clip.mp4"
@@ -138,9 +133,9 @@ def test_run_conversion_pads_odd_dimensions(odd_width_source_file: Path, tmp_pat
     assert height % 2 == 0
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_run_conversion_stream_copy(source_file: Path) -> None:
-    """Stream copy audio and video and produce trimmed clip."""
-    probe.clear_cache()
+    """Stream copy audio and video into a trimmed clip."""
     opts = Options(
         source=source_file,
         time=TimeOptions(start="00:00:01", end="00:00:03"),
@@ -157,32 +152,30 @@ def test_run_conversion_stream_copy(source_file: Path) -> None:
     commands, result = executor.run_conversion(opts)
     assert commands == (expected_args,)
     assert result.success
-    assert result.output is not None
     assert result.output == expected_output
-    out_path = Path(result.output)
-    assert out_path.is_file()
-    duration = probe.get_video_duration_sec(RuntimeContext(), result.output)
-    assert duration is not None
-    assert duration < 4.1
+    assert expected_args[expected_args.index("-ss") + 1] == "00:00:01.000"
+    assert expected_args[expected_args.index("-t") + 1] == "00:00:02.000"
 
 
-def test_ffclipper_end_to_end(source_file: Path, capsys: pytest.CaptureFixture[str]) -> None:
+@pytest.mark.slow
+def test_ffclipper_end_to_end(source_file: Path) -> None:
     """Run the high-level ffclipper flow to encode a clip."""
-    probe.clear_cache()
     opts = Options(source=source_file, time=TimeOptions(start="00:00:01", end="00:00:02"))
 
     output = source_file.with_name(f"{source_file.stem}_clip.{DEFAULT_CONTAINER.value}")
     output.unlink(missing_ok=True)
-    code = executor.ffclipper(opts)
+    messages: list[str] = []
+    code = executor.ffclipper(opts, status_callback=messages.append)
     assert code == 0
-    out = capsys.readouterr().out.strip()
-    assert out == str(output.absolute())
+    assert messages == [str(output.absolute())]
     assert output.is_file()
-    duration = probe.get_video_duration_sec(RuntimeContext(), str(output))
+    with RuntimeContext() as ctx:
+        duration = probe.get_video_duration_sec(ctx, str(output))
     assert duration is not None
     assert 0.9 <= duration <= 1.1
 
 
+@pytest.mark.usefixtures("no_ffmpeg")
 def test_run_conversion_custom_output(source_file: Path, tmp_path: Path) -> None:
     """Place the output file at a custom path."""
     custom = tmp_path / "nested" / "custom_output.mkv"
@@ -196,8 +189,9 @@ def test_run_conversion_custom_output(source_file: Path, tmp_path: Path) -> None
     assert result.success
     assert result.output == str(custom)
     assert commands[-1][-1] == str(custom)
+    assert commands[-1][commands[-1].index("-ss") + 1] == "00:00:01.000"
+    assert commands[-1][commands[-1].index("-t") + 1] == "00:00:01.000"
     assert custom.parent.is_dir()
-    assert custom.is_file()
 
 
 def test_output_parent_must_be_directory(source_file: Path, tmp_path: Path) -> None:
@@ -218,42 +212,7 @@ def test_output_parent_must_be_directory(source_file: Path, tmp_path: Path) -> N
     assert str(parent) in result.error
 
 
-@pytest.fixture
-def sample_video_with_subs(tmp_path: Path) -> Path:
-    srt = tmp_path / "subs.srt"
-    srt.write_text("1\n00:00:01,000 --> 00:00:02,000\nhello\n")
-    video = tmp_path / "video.mkv"
-    ffmpeg = shutil.which("ffmpeg")
-    assert ffmpeg
-    subprocess.run(  # noqa: S603
-        [
-            ffmpeg,
-            "-v",
-            "error",
-            "-f",
-            "lavfi",
-            "-i",
-            "color=s=200x200:d=4",
-            "-i",
-            str(srt),
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            "-c:s",
-            "srt",
-            "-map",
-            "0",
-            "-map",
-            "1",
-            "-y",
-            str(video),
-        ],
-        check=True,
-    )
-    return video
-
-
+@pytest.mark.xdist_group("subs_sample")
 def test_dry_run_lists_extract_and_final(sample_video_with_subs: Path, tmp_path: Path) -> None:
     opts = Options(
         source=sample_video_with_subs,
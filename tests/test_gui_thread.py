@@ -9,9 +9,14 @@ from ffclipper.gui.ui_helpers import VideoProcessingThread
 from ffclipper.models import Options
 
 
-def test_thread_emits_failure_on_unexpected_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    QCoreApplication.instance() or QCoreApplication([])
+@pytest.fixture(scope="session")
+def qapp() -> QCoreApplication:
+    """Create the Qt application once and share it across the module's tests."""
+    return QCoreApplication.instance() or QCoreApplication([])
+
 
+@pytest.mark.usefixtures("qapp")
+def test_thread_emits_failure_on_unexpected_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     src = tmp_path / "in.mp4"
     src.write_text("data")
 
@@ -29,9 +34,8 @@ def test_thread_emits_failure_on_unexpected_error(tmp_path: Path, monkeypatch: p
     assert finished_payloads == [{"success": False, "error": "Conversion failed: boom"}]
 
 
+@pytest.mark.usefixtures("qapp")
 def test_controller_starts_thread(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:  # noqa: C901
-    QCoreApplication.instance() or QCoreApplication([])
-
     started: bool = False
 
     class DummySignal:
@@ -8,11 +8,17 @@ import pytest
 from ffclipper.backend.executor import open_directory
 
 
+@pytest.fixture(autouse=True)
+def _stub_which(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Resolve every tool to ``/usr/bin/<name>`` without walking ``PATH``."""
+    monkeypatch.setattr(shutil, "which", lambda cmd: f"/usr/bin/{cmd}")
+
+
 @pytest.mark.parametrize(
     ("platform", "expected"),
     [
-        ("win32", ["explorer", "/select,", "FILE"]),
-        ("darwin", ["open", "-R", "FILE"]),
+        ("win32", ["/usr/bin/explorer", "/select,", "FILE"]),
+        ("darwin", ["/usr/bin/open", "-R", "FILE"]),
     ],
 )
 def test_open_directory_selects_file(
@@ -30,7 +36,6 @@ def test_open_directory_selects_file(
 
     monkeypatch.setattr(sys, "platform", platform)
     monkeypatch.setattr(subprocess, "run", fake_run)
-    monkeypatch.setattr(shutil, "which", lambda _cmd: expected[0])
     open_directory(str(file))
     expected_cmd = expected.copy()
     expected_cmd[-1] = str(file)
@@ -47,6 +52,5 @@ def test_open_directory_linux_opens_parent(monkeypatch: pytest.MonkeyPatch, tmp_
 
     monkeypatch.setattr(sys, "platform", "linux")
     monkeypatch.setattr(subprocess, "run", fake_run)
-    monkeypatch.setattr(shutil, "which", lambda _: "/usr/bin/xdg-open")
     open_directory(str(file))
     assert recorded["cmd"] == ["/usr/bin/xdg-open", str(file.parent)]
@@ -1,6 +1,8 @@
 """Tests for option helpers."""
 
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 import pytest
 
@@ -8,15 +10,29 @@ import ffclipper.models.types as mtypes
 from ffclipper.models import Options
 from ffclipper.models.options import (
     AudioOptions,
-    SubtitlesOptions,
+    RuntimeOptions,
     TimeOptions,
     VideoOptions,
     compute_time_bounds,
 )
 from ffclipper.models.types import Container, Encoder, Resolution, VideoCodec
+from ffclipper.models.verbosity import Verbosity
+from ffclipper.tools import format_time, parse_timespan_to_ms
 
 from .conftest import VIDEO_DURATION_SEC
 
+# Compatibility table with no audio codecs allowed in WebM, built once for the swap below.
+_WEBM_WITHOUT_AUDIO = MappingProxyType(
+    {
+        **mtypes._CONTAINER_COMPATIBILITY,  # noqa: SLF001
+        mtypes.Container.WEBM: mtypes.ContainerCompatibility(
+            video_codecs=mtypes.Container.WEBM.compatibility.video_codecs,
+            audio_codecs=frozenset(),
+            subtitle_codecs=frozenset(),
+        ),
+    }
+)
+
 START_TS = "00:00:01"
 END_TS = "00:00:03"
 START_MS = 1_000
@@ -56,81 +72,67 @@ def test_compute_trim_bounds_invalid_durations(source_file: Path, trim: TimeOpti
         compute_time_bounds(opts, VIDEO_DURATION_SEC)
 
 
-def test_time_options_rejects_invalid_format() -> None:
-    """Reject invalid time strings."""
-    with pytest.raises(ValueError):
-        TimeOptions(start="notatime")
-
-
-def test_validate_stream_copy_constraints_resolution(source_file: Path) -> None:
-    """Reject resolution change when stream copying video."""
-    with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True, resolution=Resolution.P720),
-        )
-
-
-def test_validate_stream_copy_constraints_encoder(source_file: Path) -> None:
-    """Reject encoder selection when stream copying video."""
-    with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True, encoder=Encoder.H264_NVENC),
-        )
-
-
-def test_validate_stream_copy_constraints_codec(source_file: Path) -> None:
-    """Reject codec selection when stream copying video."""
-    with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True, codec=VideoCodec.HEVC),
-        )
-
-
-def test_validate_stream_copy_constraints_target_size_mb(source_file: Path) -> None:
-    """Reject target size control when stream copying video."""
-    with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True),
-            target_size_mb=20,
-        )
+@pytest.mark.parametrize(
+    ("raw", "expected_ms"),
+    [
+        ("90", 90_000),
+        ("1.5", 1_500),
+        ("90s", 90_000),
+        ("500ms", 500),
+        ("2h", 7_200_000),
+        ("1:30", 90_000),
+        ("00:01:30.250", 90_250),
+        ("1m20s", 80_000),
+    ],
+)
+def test_parse_timespan_to_ms(raw: str, expected_ms: int) -> None:
+    """Parse the common timespan shapes and fall back for compound forms."""
+    assert parse_timespan_to_ms(raw) == expected_ms
 
 
-def test_validate_audio_codec_requires_encoding(source_file: Path) -> None:
-    """Reject downmix when audio stream copy is enabled."""
-    with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            audio=AudioOptions(copy=True, downmix_to_stereo=True),
-        )
+@pytest.mark.parametrize(
+    ("seconds", "kwargs", "expected"),
+    [
+        (3725.0625, {}, "01:02:05.062"),
+        (59.9996, {}, "00:01:00.000"),
+        (1.2341, {"mode": "ceil"}, "00:00:01.235"),
+        (1.2349, {"mode": "floor"}, "00:00:01.234"),
+        (0.35, {"places": 1}, "00:00:00.3"),
+        (61.6, {"places": 0}, "00:01:02"),
+    ],
+)
+def test_format_time(seconds: float, kwargs: dict[str, Any], expected: str) -> None:
+    """Format seconds with the requested precision and rounding."""
+    assert format_time(seconds, **kwargs) == expected
 
 
-def test_validate_stream_copy_constraints_burn_subtitles(source_file: Path) -> None:
-    """Reject subtitle burn-in when stream copying video."""
+def test_time_options_rejects_invalid_format() -> None:
+    """Reject invalid time strings."""
     with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True),
-            subtitles=SubtitlesOptions(burn=0),
-        )
+        TimeOptions(start="notatime")
 
 
-def test_validate_video_encoder_incompatible(source_file: Path) -> None:
-    """Reject incompatible encoder/container combination."""
-    with pytest.raises(ValueError):
-        Options(source=source_file, container=Container.WEBM)
-
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"video": {"copy": True, "resolution": Resolution.P720}}, id="copy-resolution"),
+        pytest.param({"video": {"copy": True, "encoder": Encoder.H264_NVENC}}, id="copy-encoder"),
+        pytest.param({"video": {"copy": True, "codec": VideoCodec.HEVC}}, id="copy-codec"),
+        pytest.param({"video": {"copy": True}, "target_size_mb": 20}, id="copy-target-size"),
+        pytest.param({"audio": {"copy": True, "downmix_to_stereo": True}}, id="audio-copy-downmix"),
+        pytest.param({"video": {"copy": True}, "subtitles": {"burn": 0}}, id="copy-burn-subtitles"),
+        pytest.param({"container": Container.WEBM}, id="encoder-container"),
+        pytest.param({"video": {"codec": VideoCodec.HEVC, "encoder": Encoder.X264}}, id="codec-encoder"),
+    ],
+)
+def test_options_rejects(source_file: Path, kwargs: dict[str, Any]) -> None:
+    """Reject option combinations that cannot be honored.
 
-def test_validate_codec_encoder_mismatch(source_file: Path) -> None:
-    """Reject mismatched codec and encoder selection."""
+    Stream copy excludes anything that needs re-encoding, and the encoder has
+    to suit both the requested codec and the container.
+    """
     with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(codec=VideoCodec.HEVC, encoder=Encoder.X264),
-        )
+        Options(source=source_file, **kwargs)
 
 
 def test_validate_codec_encoder_match(source_file: Path) -> None:
@@ -145,20 +147,59 @@ def test_validate_codec_encoder_match(source_file: Path) -> None:
 
 def test_validate_audio_codec_incompatible(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
     """Reject unsupported audio codec for container."""
-    current = mtypes._CONTAINER_COMPATIBILITY[mtypes.Container.WEBM]  # noqa: SLF001
-    compat = mtypes.ContainerCompatibility(
-        video_codecs=current.video_codecs,
-        audio_codecs=set(),
-        subtitle_codecs=set(),
-    )
-    monkeypatch.setitem(
-        mtypes._CONTAINER_COMPATIBILITY,  # noqa: SLF001
-        mtypes.Container.WEBM,
-        compat,
-    )
+    monkeypatch.setattr(mtypes, "_CONTAINER_COMPATIBILITY", _WEBM_WITHOUT_AUDIO)
     with pytest.raises(ValueError):
         Options(
             source=source_file,
             container=Container.WEBM,
             video=VideoOptions(encoder=Encoder.SVT_AV1),
         )
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        (Verbosity.OUTPUT, Verbosity.OUTPUT),
+        (1, Verbosity.COMMANDS),
+        ("2", Verbosity.OUTPUT),
+        ("01", Verbosity.COMMANDS),
+        (" Commands ", Verbosity.COMMANDS),
+        ("quiet", Verbosity.QUIET),
+    ],
+)
+def test_runtime_verbosity_accepts_names_and_numbers(raw: object, expected: Verbosity) -> None:
+    """Parse verbosity from enum members, integers, digits, or names."""
+    assert RuntimeOptions(verbosity=raw).verbosity is expected
+
+
+@pytest.mark.parametrize("raw", ["loud", 3, [1], 1.0, "1.0"])
+def test_runtime_verbosity_rejects_unknown(raw: object) -> None:
+    """Reject unknown verbosity levels."""
+    with pytest.raises(ValueError):
+        RuntimeOptions(verbosity=raw)
+
+
+def test_to_cli_args_lists_only_changed_options(source_file: Path, tmp_path: Path) -> None:
+    """Emit flags only for values that differ from the GUI defaults."""
+    opts = Options(
+        source=source_file,
+        output=tmp_path / "out.mkv",
+        audio=AudioOptions(include=False, downmix_to_stereo=False),
+        video=VideoOptions(resolution=Resolution.P720),
+        runtime=RuntimeOptions(verbosity=Verbosity.COMMANDS),
+    )
+    args = opts.to_cli_args()
+    assert args[:2] == ["--source", str(source_file)]
+    assert args[2:] == [
+        "--output",
+        str(tmp_path / "out.mkv"),
+        "--container",
+        "mkv",
+        "--audio.no-include",
+        "--audio.no-downmix-to-stereo",
+        "--video.resolution",
+        "720p",
+        "--runtime.verbosity",
+        "commands",
+    ]
+    assert "--output" not in opts.to_cli_args(suppress_output=True)
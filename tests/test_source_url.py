@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from ffclipper.models import ClipPlan, Options, RuntimeContext
+from ffclipper.models import ClipPlan, Container, Options, RuntimeContext
 from ffclipper.models import plan as plan_module
 
 
@@ -28,8 +28,17 @@ def test_url_without_filename_requires_output(monkeypatch: pytest.MonkeyPatch) -
     """URLs missing a filename require an explicit output path."""
     url = "https://example.com"
     opts = Options(source=url)
-    monkeypatch.setattr(plan_module, "_ensure_tools", lambda ctx, opts: None)
-    monkeypatch.setattr(plan_module, "_probe_duration", lambda ctx, src: 1.0)
-    monkeypatch.setattr(plan_module, "_validate_container", lambda opts, ctx: (None, None))
+    monkeypatch.setattr(plan_module, "_ensure_tools", lambda ctx: None)
+    monkeypatch.setattr(plan_module, "_ensure_encoder", lambda ctx, opts: None)
+    monkeypatch.setattr(plan_module.probe, "get_full_info", lambda ctx, src: None)
+    monkeypatch.setattr(plan_module, "_probe_duration", lambda info, src: 1.0)
+    monkeypatch.setattr(plan_module, "_validate_container", lambda opts, info: (None, None))
     with pytest.raises(ValueError):
         ClipPlan.from_options(opts, RuntimeContext())
+
+
+def test_url_filename_with_tilde_is_not_expanded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A URL filename starting with "~" is kept literally in the working directory."""
+    monkeypatch.chdir(tmp_path)
+    out = plan_module.derive_output_path("http://example.com/~clip.mp4", None, Container.MKV)
+    assert out == tmp_path / "~clip_clip.mkv"
@@ -1,52 +1,17 @@
-import shutil
-import subprocess
 from pathlib import Path
 
 import pytest
 
 from ffclipper.backend.builder import subs
 from ffclipper.backend.executor import run_conversion
-from ffclipper.models import ClipPlan, Options, RuntimeContext, SubtitleBurnMethod
+from ffclipper.models import ClipPlan, Encoder, Options, RuntimeContext, SubtitleBurnMethod
 from ffclipper.models import plan as plan_module
 from ffclipper.models.options import AudioOptions, RuntimeOptions, SubtitlesOptions, TimeOptions
 from ffclipper.models.types import Container
 
+from .conftest import VIDEO_DURATION_SEC
 
-@pytest.fixture
-def sample_video_with_subs(tmp_path: Path) -> Path:
-    srt = tmp_path / "subs.srt"
-    srt.write_text("1\n00:00:01,000 --> 00:00:02,000\nhello\n")
-    video = tmp_path / "video.mkv"
-    ffmpeg = shutil.which("ffmpeg")
-    assert ffmpeg
-
-    subprocess.run(  # noqa: S603
-        [
-            ffmpeg,
-            "-v",
-            "error",
-            "-f",
-            "lavfi",
-            "-i",
-            "color=s=200x200:d=4",
-            "-i",
-            str(srt),
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            "-c:s",
-            "srt",
-            "-map",
-            "0",
-            "-map",
-            "1",
-            "-y",
-            str(video),
-        ],
-        check=True,
-    )
-    return video
+pytestmark = pytest.mark.xdist_group("subs_sample")
 
 
 def test_defaults_none_without_burn(sample_video_with_subs: Path) -> None:
@@ -133,6 +98,10 @@ def test_extract_method_invokes_prepare(
 
 def test_auto_method_uses_ratio(sample_video_with_subs: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(plan_module, "AUTO_EXTRACT_RATIO_THRESHOLD", 0.5)
+    # Only the clip/source duration ratio matters here, so skip probing the source.
+    monkeypatch.setattr(plan_module.probe, "get_full_info", lambda ctx, src: None)
+    monkeypatch.setattr(plan_module, "_probe_duration", lambda info, src: VIDEO_DURATION_SEC)
+    monkeypatch.setattr(plan_module, "_validate_container", lambda opts, info: (None, None))
     short_opts = Options(
         source=sample_video_with_subs,
         output=tmp_path / "short.mkv",
@@ -140,11 +109,8 @@ def test_auto_method_uses_ratio(sample_video_with_subs: Path, tmp_path: Path, mo
         subtitles=SubtitlesOptions(burn=0, burn_method=SubtitleBurnMethod.AUTO),
         audio=AudioOptions(include=False, downmix_to_stereo=False),
         time=TimeOptions(start="0", duration="1"),
+        runtime=RuntimeOptions(dry_run=True),
     )
-    with RuntimeContext() as ctx:
-        short_plan = ClipPlan.from_options(short_opts, ctx)
-    assert short_plan.subtitle_burn_method is SubtitleBurnMethod.EXTRACT
-
     long_opts = Options(
         source=sample_video_with_subs,
         output=tmp_path / "long.mkv",
@@ -152,15 +118,27 @@ def test_auto_method_uses_ratio(sample_video_with_subs: Path, tmp_path: Path, mo
         subtitles=SubtitlesOptions(burn=0, burn_method=SubtitleBurnMethod.AUTO),
         audio=AudioOptions(include=False, downmix_to_stereo=False),
         time=TimeOptions(start="0", duration="3"),
+        runtime=RuntimeOptions(dry_run=True),
     )
+    # One context for both plans, so the tool checks run once.
     with RuntimeContext() as ctx:
+        short_plan = ClipPlan.from_options(short_opts, ctx)
         long_plan = ClipPlan.from_options(long_opts, ctx)
+    assert short_plan.subtitle_burn_method is SubtitleBurnMethod.EXTRACT
     assert long_plan.subtitle_burn_method is SubtitleBurnMethod.INLINE
 
 
-def test_burn_filter_requires_prepare(sample_video_with_subs: Path, tmp_path: Path) -> None:
+def test_burn_filter_requires_prepare(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # No media is read: plan against an empty stub with tools and probing stubbed out.
+    source = tmp_path / "video.mkv"
+    source.touch()
+    monkeypatch.setattr(plan_module, "check_ffmpeg_version", lambda ctx: "test")
+    monkeypatch.setattr(plan_module, "available_encoders", lambda ctx: {Encoder.X264})
+    monkeypatch.setattr(plan_module.probe, "get_full_info", lambda ctx, src: None)
+    monkeypatch.setattr(plan_module, "_probe_duration", lambda info, src: VIDEO_DURATION_SEC)
+    monkeypatch.setattr(plan_module, "_validate_container", lambda opts, info: (None, None))
     opts = Options(
-        source=sample_video_with_subs,
+        source=source,
         output=tmp_path / "out.mkv",
         container=Container.MKV,
         subtitles=SubtitlesOptions(burn=0, burn_method=SubtitleBurnMethod.EXTRACT),
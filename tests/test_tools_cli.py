@@ -0,0 +1,66 @@
+"""Tests for FFmpeg/ffprobe process helpers."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ffclipper.tools import cli
+from ffclipper.tools.helpers import status_emitter
+
+
+def test_run_streaming_splits_progress_updates() -> None:
+    r"""Forward ``\r`` progress updates in place and return universal-newline output."""
+    script = "import sys; sys.stdout.write('start\\r\\nframe=1\\rframe=2\\rdone\\nend')"
+    logged: list[str] = []
+    out = cli._run_streaming(  # noqa: SLF001
+        [sys.executable, "-c", script],
+        creationflags=0,
+        log=logged.append,
+    )
+    assert logged == ["start", "frame=1\r", "frame=2\r", "done", "end"]
+    assert out == "start\nframe=1\nframe=2\ndone\nend"
+
+
+def test_status_callback_receives_progress_without_carriage_return() -> None:
+    r"""Only the ``print`` path keeps ``\r``; other callbacks get plain progress text."""
+    script = "import sys; sys.stdout.write('frame=1\\rframe=2\\rdone\\n')"
+    received: list[str] = []
+    cli._run_streaming(  # noqa: SLF001
+        [sys.executable, "-c", script],
+        creationflags=0,
+        log=status_emitter(received.append),
+    )
+    assert received == ["frame=1", "frame=2", "done"]
+
+
+def test_run_captures_universal_newline_output() -> None:
+    """Decode captured bytes as UTF-8 with universal newlines, raising on failure."""
+    script = "import sys; sys.stdout.buffer.write('a\\r\\nb\\r\\u00e9'.encode()); sys.exit({code})"
+    assert cli.run(sys.executable, ["-c", script.format(code=0)]) == "a\nb\n\u00e9"
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        cli.run(sys.executable, ["-c", script.format(code=3)])
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.output == "a\nb\n\u00e9"
+
+
+def test_cache_key_reuses_stat_cache(tmp_path: Path) -> None:
+    """Reuse recorded file metadata when a stat cache is shared."""
+    media = tmp_path / "a.mp4"
+    media.write_text("a")
+    stat_cache: dict[str, cli.FileStamp] = {}
+    first = cli.cache_key(["-i", str(media)], stat_cache=stat_cache)
+    assert stat_cache == {str(media): (media.stat().st_mtime_ns, 1)}
+
+    media.write_text("bigger")
+    assert cli.cache_key(["-i", str(media)], stat_cache=stat_cache) == first
+    assert cli.cache_key(["-i", str(media)]) != first
+
+
+def test_cache_key_skips_non_path_tokens(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only stat tokens that could name a file."""
+    monkeypatch.chdir(tmp_path)
+    stat_cache: dict[str, cli.FileStamp] = {}
+    cli.cache_key(["-v", "error", "-of", "json", "pipe:0", "null", "clip.mkv", "sub/dir"], stat_cache=stat_cache)
+    assert set(stat_cache) == {"clip.mkv", "sub/dir"}
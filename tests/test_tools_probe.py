@@ -2,27 +2,29 @@
 
 from __future__ import annotations
 
-import importlib
+import json
 import os
 import shutil
 import subprocess
+import threading
 import time
+from functools import partial
 from typing import TYPE_CHECKING, Never
 
-from diskcache import Cache
+import pytest
 
+from ffclipper.models.ffprobe import VideoColorInfo
+from ffclipper.models.types import ColorTransfer
 from ffclipper.tools import probe
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from pathlib import Path
 
-    import pytest
+    from diskcache import Cache
 
-probe_module = importlib.import_module("ffclipper.tools.probe")
 
-
-def test_run_caches_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_run_caches_failure(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
     """Cache ``ffprobe`` failures to avoid repeated executions."""
     calls = {"count": 0}
 
@@ -36,10 +38,9 @@ def test_run_caches_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) ->
         calls["count"] += 1
         raise subprocess.CalledProcessError(1, cmd)
 
-    monkeypatch.setattr(probe_module, "run_ffprobe", fake_run_ffprobe)
+    monkeypatch.setattr(probe, "run_ffprobe", fake_run_ffprobe)
 
-    cache = Cache(str(tmp_path))
-    ctx = probe.RuntimeContext(cache=cache)
+    ctx = probe.RuntimeContext(cache=memory_cache)
 
     cmd = ["-version"]
     assert probe.run(ctx, cmd) is None
@@ -47,8 +48,16 @@ def test_run_caches_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) ->
     assert probe.run(ctx, cmd) is None
     assert calls["count"] == 1
 
+    # Failures expire so transient errors are retried.
+    monkeypatch.setattr(probe, "FAILURE_TTL_S", 0.05)
+    assert probe.run(ctx, ["-buildconf"]) is None
+    assert calls["count"] == 2
+    time.sleep(0.1)
+    assert probe.run(ctx, ["-buildconf"]) is None
+    assert calls["count"] == 3
 
-def test_run_includes_file_metadata(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+
+def test_run_includes_file_metadata(tmp_path: Path, memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
     """Invalidate cache when probed file metadata changes."""
     calls = {"count": 0}
 
@@ -62,10 +71,9 @@ def test_run_includes_file_metadata(tmp_path: Path, monkeypatch: pytest.MonkeyPa
         calls["count"] += 1
         return "data"
 
-    monkeypatch.setattr(probe_module, "run_ffprobe", fake_run_ffprobe)
+    monkeypatch.setattr(probe, "run_ffprobe", fake_run_ffprobe)
 
-    cache = Cache(str(tmp_path / "cache"))
-    ctx = probe.RuntimeContext(cache=cache)
+    ctx = probe.RuntimeContext(cache=memory_cache)
 
     media = tmp_path / "a.mp4"
     media.write_text("a")
@@ -80,28 +88,256 @@ def test_run_includes_file_metadata(tmp_path: Path, monkeypatch: pytest.MonkeyPa
     assert probe.run(ctx, cmd) == "data"
     assert calls["count"] == 2
 
-    time.sleep(0.01)
-    os.utime(media, None)
+    stat = media.stat()
+    os.utime(media, (stat.st_atime, stat.st_mtime + 1.0))
     assert probe.run(ctx, cmd) == "data"
     assert calls["count"] == 3
 
 
-def test_get_audio_codec(tmp_path: Path, source_file: Path) -> None:
+def test_get_audio_codec(shared_source_file: Path, runtime_ctx: probe.RuntimeContext) -> None:
     """Return audio codec information for a clip."""
-    local_src = tmp_path / source_file.name
-    shutil.copy(source_file, local_src)
-    ctx = probe.RuntimeContext()
-    info = probe.get_audio_codec(ctx, str(local_src))
+    info = probe.get_audio_codec(runtime_ctx, str(shared_source_file))
     assert info is not None
     assert info.codec == "aac"
 
 
-def test_get_audio_bitrate(tmp_path: Path, source_file: Path) -> None:
+def test_get_audio_bitrate(shared_source_file: Path, runtime_ctx: probe.RuntimeContext) -> None:
     """Return audio bitrate information for a clip."""
-    local_src = tmp_path / source_file.name
-    shutil.copy(source_file, local_src)
-    ctx = probe.RuntimeContext()
-    info = probe.get_audio_bitrate(ctx, str(local_src))
+    info = probe.get_audio_bitrate(runtime_ctx, str(shared_source_file))
     assert info is not None
     assert info.bitrate is not None
     assert info.bitrate > 0
+
+
+def test_duration_falls_back_to_stream(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use the video stream duration when the container reports none."""
+    calls: list[list[str]] = []
+
+    def fake_run(ctx: probe.RuntimeContext, cmd: list[str]) -> str:
+        calls.append(cmd)
+        return json.dumps({"format": {}, "streams": [{"codec_type": "video", "duration": "2.5"}]})
+
+    monkeypatch.setattr(probe, "run", fake_run)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    assert probe.get_video_duration_sec(ctx, "in.mkv") == 2.5
+    assert len(calls) == 1
+
+
+def test_get_full_info(tmp_path: Path, memory_cache: Cache, source_file: Path) -> None:
+    """Collect duration and first-stream metadata from one ffprobe call."""
+    local_src = tmp_path / source_file.name
+    shutil.copy(source_file, local_src)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    info = probe.get_full_info(ctx, str(local_src))
+    assert info is not None
+    assert info.duration_sec is not None
+    assert 3.9 <= info.duration_sec <= 4.1
+    assert info.video is not None
+    assert info.video.codec == "h264"
+    assert info.audio is not None
+    assert info.audio.codec == "aac"
+    assert info.audio.bitrate is not None
+    assert info.audio.bitrate > 0
+
+
+def test_get_video_color_info_single_call(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read all color fields from one JSON ffprobe call."""
+    calls: list[list[str]] = []
+
+    def fake_run(ctx: probe.RuntimeContext, cmd: list[str]) -> str:
+        calls.append(cmd)
+        return json.dumps(
+            {
+                "streams": [
+                    {
+                        "codec_type": "video",
+                        "color_primaries": "bt2020",
+                        "color_transfer": "smpte2084",
+                        "color_space": "bt2020nc",
+                    }
+                ]
+            }
+        )
+
+    monkeypatch.setattr(probe, "run", fake_run)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    info = probe.get_video_color_info(ctx, "in.mkv")
+    assert info == VideoColorInfo(primaries="bt2020", transfer=ColorTransfer.PQ, space="bt2020nc")
+    assert len(calls) == 1
+
+
+def test_stream_helpers_share_full_probe(
+    tmp_path: Path, memory_cache: Cache, source_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Codec and bitrate helpers reuse one cached ffprobe call."""
+    local_src = tmp_path / source_file.name
+    shutil.copy(source_file, local_src)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    probe.get_full_info(ctx, str(local_src))
+
+    def fail(*_args: object, **_kwargs: object) -> Never:
+        raise AssertionError("unexpected ffprobe call")
+
+    monkeypatch.setattr(probe, "run_ffprobe", fail)
+    video = probe.get_video_codec(ctx, str(local_src))
+    audio = probe.get_audio_codec(ctx, str(local_src))
+    bitrate = probe.get_audio_bitrate(ctx, str(local_src))
+    assert video is not None
+    assert video.codec == "h264"
+    assert audio is not None
+    assert audio.codec == "aac"
+    assert bitrate is not None
+    assert bitrate.bitrate
+
+
+def test_batch_runs_tasks_concurrently() -> None:
+    """Run probe tasks on the shared pool and return results by name."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def task(value: int) -> int:
+        barrier.wait()
+        return value
+
+    assert probe.batch({"a": lambda: task(1), "b": lambda: task(2)}) == {"a": 1, "b": 2}
+
+
+def test_run_limits_concurrent_ffprobe(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Never run more ffprobe processes at once than ``ctx.max_probes``."""
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def fake_run_ffprobe(cmd: list[str], **_: object) -> str:
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return cmd[-1]
+
+    monkeypatch.setattr(probe, "run_ffprobe", fake_run_ffprobe)
+    ctx = probe.RuntimeContext(cache=memory_cache, max_probes=1)
+    tasks = {str(i): partial(probe.run, ctx, ["-v", str(i)]) for i in range(4)}
+    assert probe.batch(tasks) == {str(i): str(i) for i in range(4)}
+    assert active["peak"] == 1
+
+
+def test_keyframes_from_packet_flags_first(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read keyframes from packet flags without decoding when available."""
+    calls: list[list[str]] = []
+
+    def fake_run(ctx: probe.RuntimeContext, cmd: list[str], **_: object) -> str:
+        calls.append(cmd)
+        return "4.000000,K__\n4.040000,___\n2.000000,K__\n"
+
+    monkeypatch.setattr(probe, "run", fake_run)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    assert probe.list_kfs_in_window_sec_frames(ctx, "in.mkv", 2.5, 3.5) == [2.0, 4.0]
+    assert len(calls) == 1
+    assert "-show_packets" in calls[0]
+    assert "-skip_frame" not in calls[0]
+
+
+def test_keyframe_timeline_caches_parsed_times(
+    tmp_path: Path, memory_cache: Cache, source_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """List the whole file once, then serve the parsed timeline from the cache."""
+    local_src = tmp_path / source_file.name
+    shutil.copy(source_file, local_src)
+    calls: list[list[str]] = []
+    real_run_ffprobe = probe.run_ffprobe
+
+    def counting_run_ffprobe(cmd: list[str], **kwargs: bool) -> str:
+        calls.append(cmd)
+        return real_run_ffprobe(cmd, **kwargs)
+
+    monkeypatch.setattr(probe, "run_ffprobe", counting_run_ffprobe)
+    cache = memory_cache
+    kfs = probe.get_keyframe_timeline(probe.RuntimeContext(cache=cache), str(local_src))
+    assert kfs
+    assert kfs[0] == 0.0
+    assert probe.get_keyframe_timeline(probe.RuntimeContext(cache=cache), str(local_src)) == kfs
+    assert len(calls) == 1
+    assert not any(isinstance(value, str) for value in cache.values())
+
+
+def test_snap_near_end_of_file_skips_whole_file_listing(
+    tmp_path: Path, memory_cache: Cache, source_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A bounded window that runs past the end of the file brackets the clip."""
+    local_src = tmp_path / source_file.name
+    shutil.copy(source_file, local_src)
+    calls: list[list[str]] = []
+    real_run_ffprobe = probe.run_ffprobe
+
+    def counting_run_ffprobe(cmd: list[str], **kwargs: bool) -> str:
+        calls.append(cmd)
+        return real_run_ffprobe(cmd, **kwargs)
+
+    monkeypatch.setattr(probe, "run_ffprobe", counting_run_ffprobe)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    # The only keyframe precedes the window and the clip ends before the pad does.
+    start, _end = probe.snap_window_copy_bounds(ctx, str(local_src), 0.5, 1.5)
+    assert start == 0.0
+    assert all("-read_intervals" in cmd for cmd in calls if "-show_packets" in cmd)
+
+
+def test_snap_widens_bounded_window_before_whole_file_listing(
+    memory_cache: Cache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Grow the bounded packet window until it brackets a long GOP."""
+    calls: list[list[str]] = []
+
+    def fake_run(ctx: probe.RuntimeContext, cmd: list[str], **_: object) -> str:
+        calls.append(cmd)
+        return "25.000000,K__\n" if "14.0%28.0" in cmd else "10.000000,K__\n25.000000,K__\n"
+
+    monkeypatch.setattr(probe, "run", fake_run)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    assert probe.snap_window_copy_bounds(ctx, "in.mkv", 20.0, 22.0) == (10.0, 25.0)
+    assert [cmd[cmd.index("-read_intervals") + 1] for cmd in calls] == ["14.0%28.0", "8.0%34.0"]
+
+
+def test_snap_stops_at_bounded_packet_probe(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skip the whole-file listing when the bounded probe brackets the window."""
+    calls: list[list[str]] = []
+
+    def fake_run(ctx: probe.RuntimeContext, cmd: list[str], **_: object) -> str:
+        calls.append(cmd)
+        return "2.000000,K__\n2.040000,___\n6.000000,K__\n"
+
+    monkeypatch.setattr(probe, "run", fake_run)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    assert probe.snap_window_copy_bounds(ctx, "in.mkv", 3.0, 5.0) == (2.0, 6.0)
+    assert len(calls) == 1
+    assert "0.0%11.0" in calls[0]
+
+
+def test_run_memoizes_results_per_context(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Serve repeat queries from the context without touching the disk cache."""
+    monkeypatch.setattr(probe, "run_ffprobe", lambda cmd, **_: "data")
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    assert probe.run(ctx, ["-version"]) == "data"
+    ctx.cache.clear()
+    monkeypatch.setattr(ctx, "cache", None)
+    assert probe.run(ctx, ["-version"]) == "data"
+
+
+def test_run_memo_evicts_least_recently_used(memory_cache: Cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the per-context memo bounded, dropping the stalest command first."""
+    monkeypatch.setattr(probe, "run_ffprobe", lambda cmd, **_: cmd[-1])
+    monkeypatch.setattr(probe, "MEMO_MAX_ENTRIES", 2)
+    ctx = probe.RuntimeContext(cache=memory_cache)
+    for name in ("a", "b", "a", "c"):
+        probe.run(ctx, ["-i", name])
+    assert [key[-1] for key in ctx.probe_results] == ["a", "c"]
+
+
+@pytest.mark.parametrize(("raw", "expected"), [("6", 6), ("0", 3), ("-2", 3), ("many", 3)])
+def test_env_positive_int_rejects_bad_values(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, raw: str, expected: int
+) -> None:
+    """Probe limits from the environment fall back to the default unless positive integers."""
+    monkeypatch.setenv("FFCLIPPER_TEST_LIMIT", raw)
+    assert probe._env_positive_int("FFCLIPPER_TEST_LIMIT", 3) == expected  # noqa: SLF001
+    assert ("FFCLIPPER_TEST_LIMIT" in caplog.text) is (expected == 3)
@@ -5,7 +5,8 @@ from pathlib import Path
 import pytest
 
 from ffclipper.models import ClipPlan, Options, RuntimeContext
-from ffclipper.tools import cli, probe
+from ffclipper.models import plan as plan_module
+from ffclipper.tools import probe
 
 
 def test_options_requires_ffmpeg(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -16,12 +17,17 @@ def test_options_requires_ffmpeg(monkeypatch: pytest.MonkeyPatch, tmp_path: Path
     def _raise(_ctx: RuntimeContext) -> str:
         raise RuntimeError("missing ffmpeg")
 
-    monkeypatch.setattr(cli, "check_ffmpeg_version", _raise)
+    probed: list[str] = []
+    # ``plan`` binds its own reference to the check, so patch it there.
+    monkeypatch.setattr(plan_module, "check_ffmpeg_version", _raise)
+    monkeypatch.setattr(probe, "get_full_info", lambda _ctx, path: probed.append(path))
     with pytest.raises(ValueError):
         ClipPlan.from_options(
             Options(source=src),
             RuntimeContext(),
         )
+    # The tool check fails before the source is probed.
+    assert probed == []
 
 
 def test_options_requires_ffprobe(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -38,3 +44,13 @@ def test_options_requires_ffprobe(monkeypatch: pytest.MonkeyPatch, tmp_path: Pat
             Options(source=src),
             RuntimeContext(),
         )
+
+
+def test_tool_checks_run_once_per_context(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
+    """Skip repeated version checks when planning several clips in one context."""
+    calls: list[RuntimeContext] = []
+    monkeypatch.setattr(probe, "check_version", calls.append)
+    with RuntimeContext() as ctx:
+        ClipPlan.from_options(Options(source=source_file), ctx)
+        ClipPlan.from_options(Options(source=source_file), ctx)
+    assert calls == [ctx]
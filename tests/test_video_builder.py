@@ -1,23 +1,27 @@
 """Tests for video encoding helpers."""
 
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
 from ffclipper.backend.builder import video
-from ffclipper.models import ClipPlan, ColorTransfer, Encoder, Options, RuntimeContext
+from ffclipper.models import ClipPlan, Encoder, Options, RuntimeContext
 from ffclipper.models import plan as plan_module
-from ffclipper.models.ffprobe import VideoColorInfo
 from ffclipper.models.options import AudioOptions, VideoOptions
-from ffclipper.tools import probe as probe_module
 from tests.conftest import VIDEO_DURATION_SEC
 
 
-def test_encode_applies_rate_multipliers(source_file: Path) -> None:
+@pytest.fixture(scope="module")
+def default_plan(shared_source_file: Path) -> Iterator[ClipPlan]:
+    """Build one plan for default options, shared by the read-only encode tests."""
+    with RuntimeContext() as ctx:
+        yield ClipPlan.from_options(Options(source=shared_source_file), ctx)
+
+
+def test_encode_applies_rate_multipliers(default_plan: ClipPlan) -> None:
     """Peak rate and buffer size scale with defined multipliers."""
-    opts = Options(source=source_file)
-    plan = ClipPlan.from_options(opts, RuntimeContext())
-    args = video.encode(plan, VIDEO_DURATION_SEC)
+    args = video.encode(default_plan, VIDEO_DURATION_SEC)
     bitrate_idx = args.index(video.BITRATE[0])
     kbps = int(args[bitrate_idx + 1][:-1])
     max_idx = args.index(video.MAXRATE[0])
@@ -52,12 +56,10 @@ def test_bitrate_reserves_target_size_mb_buffer(source_file: Path) -> None:
 
 
 @pytest.mark.parametrize("secs", [0, -1])
-def test_bitrate_rejects_non_positive_duration(source_file: Path, secs: float) -> None:
+def test_bitrate_rejects_non_positive_duration(default_plan: ClipPlan, secs: float) -> None:
     """Encode helper validates positive durations via bitrate calculation."""
-    opts = Options(source=source_file)
-    plan = ClipPlan.from_options(opts, RuntimeContext())
     with pytest.raises(ValueError):
-        video.encode(plan, secs)
+        video.encode(default_plan, secs)
 
 
 def test_nvenc_uses_fullres_multipass(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
@@ -70,45 +72,30 @@ def test_nvenc_uses_fullres_multipass(monkeypatch: pytest.MonkeyPatch, source_fi
     assert args[idx : idx + 2] == ("-multipass", "fullres")
 
 
-def test_tonemap_added_for_hdr_to_h264(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
-    """Tonemapping filter is inserted when converting HDR to H.264."""
-    monkeypatch.setattr(
-        probe_module,
-        "get_video_color_info",
-        lambda ctx, path: VideoColorInfo(transfer=ColorTransfer.PQ),
-    )
-    monkeypatch.setattr(video, "has_libplacebo", lambda _ctx: False)
-    opts = Options(source=source_file)
-    plan = ClipPlan.from_options(opts, RuntimeContext())
-    assert plan.need_tonemap is True
-    flt = video.filters(plan)
-    assert any("tonemap" in f for f in flt)
-
-
-def test_tonemap_uses_libplacebo_when_available(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
-    """Libplacebo is used for tonemapping when available."""
-    monkeypatch.setattr(
-        probe_module,
-        "get_video_color_info",
-        lambda ctx, path: VideoColorInfo(transfer=ColorTransfer.PQ),
-    )
-    monkeypatch.setattr(video, "has_libplacebo", lambda _ctx: True)
-    opts = Options(source=source_file)
-    plan = ClipPlan.from_options(opts, RuntimeContext())
-    flt = video.filters(plan)
-    assert video.TONEMAP_LIBPLACEBO in flt
-
-
-def test_tonemap_skipped_when_codec_supports_hdr(monkeypatch: pytest.MonkeyPatch, source_file: Path) -> None:
-    """Tonemapping is skipped when the target codec supports HDR."""
-    monkeypatch.setattr(
-        probe_module,
-        "get_video_color_info",
-        lambda ctx, path: VideoColorInfo(transfer=ColorTransfer.PQ),
-    )
-    opts = Options(source=source_file, video=VideoOptions(encoder=Encoder.HEVC_NVENC))
-    monkeypatch.setattr(plan_module, "available_encoders", lambda _ctx: {Encoder.HEVC_NVENC})
-    plan = ClipPlan.from_options(opts, RuntimeContext())
-    assert plan.need_tonemap is False
+@pytest.mark.parametrize(
+    ("libplacebo", "encoder", "expected"),
+    [
+        pytest.param(False, None, video.TONEMAP_ZSCALE, id="zscale-to-h264"),
+        pytest.param(True, None, video.TONEMAP_LIBPLACEBO, id="libplacebo-when-available"),
+        pytest.param(False, Encoder.HEVC_NVENC, None, id="skipped-for-hdr-codec"),
+    ],
+)
+@pytest.mark.usefixtures("hdr_probe")
+def test_tonemap_for_hdr_source(
+    monkeypatch: pytest.MonkeyPatch,
+    source_file: Path,
+    libplacebo: bool,
+    encoder: Encoder | None,
+    expected: str | None,
+) -> None:
+    """HDR sources are tonemapped unless the target codec supports HDR."""
+    monkeypatch.setattr(video, "has_libplacebo", lambda _ctx: libplacebo)
+    video_opts = VideoOptions()
+    if encoder is not None:
+        monkeypatch.setattr(plan_module, "available_encoders", lambda _ctx: {encoder})
+        video_opts = VideoOptions(encoder=encoder)
+    plan = ClipPlan.from_options(Options(source=source_file, video=video_opts), RuntimeContext())
+    assert plan.need_tonemap is (expected is not None)
     flt = video.filters(plan)
-    assert all("tonemap" not in f for f in flt)
+    tonemaps = [f for f in flt if f in {video.TONEMAP_ZSCALE, video.TONEMAP_LIBPLACEBO}]
+    assert tonemaps == ([] if expected is None else [expected])
@@ -9,44 +9,41 @@ from ffclipper.models import ClipPlan, Encoder, Options, Resolution, RuntimeCont
 from ffclipper.models.options import DEFAULT_TARGET_SIZE_MB, VideoOptions
 
 
-def test_defaults_none_with_copy(source_file: Path) -> None:
+def test_defaults_none_with_copy(shared_source_file: Path, runtime_ctx: RuntimeContext) -> None:
     """Leave encoding defaults unset when stream copying."""
-    opts = Options(source=source_file, video=VideoOptions(copy=True))
+    opts = Options(source=shared_source_file, video=VideoOptions(copy=True))
     assert opts.video.encoder is None
     assert opts.video.resolution is None
     assert opts.target_size_mb is None
-    with RuntimeContext() as ctx:
-        plan = ClipPlan.from_options(opts, ctx)
+    plan = ClipPlan.from_options(opts, runtime_ctx)
     assert plan.opts.video.encoder is None
     assert plan.opts.video.resolution is None
     assert plan.opts.target_size_mb is None
 
 
-def test_defaults_resolved_when_encoding(source_file: Path) -> None:
+def test_defaults_resolved_when_encoding(
+    shared_source_file: Path, runtime_ctx: RuntimeContext, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Resolve encoder, resolution, and target size defaults when encoding."""
-    opts = Options(source=source_file)
+    opts = Options(source=shared_source_file)
     assert opts.video.encoder is Encoder.AUTO
     assert opts.video.resolution is Resolution.ORIGINAL
     assert opts.target_size_mb == DEFAULT_TARGET_SIZE_MB
-    monkeypatch = pytest.MonkeyPatch()
     monkeypatch.setattr(plan_module, "available_encoders", lambda _ctx: {Encoder.X264})
-    with RuntimeContext() as ctx:
-        plan = ClipPlan.from_options(opts, ctx)
-    monkeypatch.undo()
+    plan = ClipPlan.from_options(opts, runtime_ctx)
     assert plan.opts.video.encoder is Encoder.X264
     assert plan.opts.video.resolution is Resolution.ORIGINAL
     assert plan.opts.target_size_mb == DEFAULT_TARGET_SIZE_MB
 
 
-def test_invalid_video_options(source_file: Path) -> None:
+@pytest.mark.parametrize(
+    "video",
+    [
+        pytest.param(VideoOptions(copy=True, resolution=Resolution.P720), id="resolution"),
+        pytest.param(VideoOptions(copy=True, encoder=Encoder.H264_NVENC), id="encoder"),
+    ],
+)
+def test_invalid_video_options(shared_source_file: Path, video: VideoOptions) -> None:
     """Reject encoding options when stream copying video."""
     with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True, resolution=Resolution.P720),
-        )
-    with pytest.raises(ValueError):
-        Options(
-            source=source_file,
-            video=VideoOptions(copy=True, encoder=Encoder.H264_NVENC),
-        )
+        Options(source=shared_source_file, video=video)